@@ -0,0 +1,326 @@
+"""
+In-process fake of the Sheets v4 endpoints tractable uses, for offline benchmarks
+"""
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import unquote, urlparse
+
+
+SHEETS_PREFIX = "/v4/spreadsheets/"
+DRIVE_PREFIX = "/drive/v3/files/"
+
+_CELL = re.compile(r"^([A-Za-z]*)(\d*)$")
+_STATUSES = {400: "INVALID_ARGUMENT", 404: "NOT_FOUND", 413: "INVALID_ARGUMENT", 429: "RESOURCE_EXHAUSTED"}
+
+
+def column_index(letters):
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index
+
+
+def column_letters(index):
+    letters = ""
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def split_range(range_name):
+    """(worksheet title or None, cell part) of an A1 range name"""
+    if '!' in range_name:
+        title, cells = range_name.rsplit('!', 1)
+    else:
+        title, cells = None, range_name
+    if title is not None and title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    return title, cells
+
+
+def parse_cells(cells):
+    """1-based (start_col, start_row, end_col, end_row), with None for open ends"""
+    parts = cells.split(':')
+    start, end = _CELL.match(parts[0]), _CELL.match(parts[-1])
+    if start is None or end is None:
+        raise FakeError(400, f"Unable to parse range: {cells}")
+    start_col = column_index(start.group(1)) if start.group(1) else 1
+    start_row = int(start.group(2)) if start.group(2) else 1
+    if len(parts) == 1:
+        return start_col, start_row, start_col, start_row
+    end_col = column_index(end.group(1)) if end.group(1) else None
+    end_row = int(end.group(2)) if end.group(2) else None
+    return start_col, start_row, end_col, end_row
+
+
+def format_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class FakeError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class FakeWorksheet:
+    """One grid of cell strings, trimmed on read the way the API trims its responses"""
+    def __init__(self, sheet_id, title, index, rows, cols):
+        self.sheet_id = sheet_id
+        self.title = title
+        self.index = index
+        self.row_count = rows
+        self.col_count = cols
+        self.cells = []
+
+    def properties(self):
+        return {
+            "sheetId": self.sheet_id,
+            "title": self.title,
+            "index": self.index,
+            "sheetType": "GRID",
+            "gridProperties": {"rowCount": self.row_count, "columnCount": self.col_count},
+        }
+
+    def load(self, values):
+        """Replace the grid contents directly, without going through the API"""
+        self.cells = [[format_value(value) for value in row] for row in values]
+        self.row_count = max(self.row_count, len(self.cells))
+        self.col_count = max([self.col_count] + [len(row) for row in self.cells])
+
+    def bounds(self, cells, clip=True):
+        start_col, start_row, end_col, end_row = parse_cells(cells)
+        end_col = self.col_count if end_col is None else end_col
+        end_row = self.row_count if end_row is None else end_row
+        if clip and (end_row > self.row_count or end_col > self.col_count):
+            raise FakeError(
+                400,
+                f"Range ('{self.title}'!{cells}) exceeds grid limits. "
+                f"Max rows: {self.row_count}, max columns: {self.col_count}"
+            )
+        return start_col, start_row, end_col, end_row
+
+    def read(self, cells):
+        start_col, start_row, end_col, end_row = self.bounds(cells)
+        values = []
+        for row in self.cells[start_row - 1:end_row]:
+            row = row[start_col - 1:end_col]
+            while row and row[-1] == "":
+                row.pop()
+            values.append(row)
+        while values and not values[-1]:
+            values.pop()
+        label = f"'{self.title}'!{column_letters(start_col)}{start_row}:{column_letters(end_col)}{end_row}"
+        return label, values
+
+    def write(self, start_col, start_row, values):
+        last_row = start_row + len(values) - 1
+        last_col = start_col + max((len(row) for row in values), default=0) - 1
+        if last_row > self.row_count or last_col > self.col_count:
+            raise FakeError(
+                400, f"Range exceeds grid limits. Max rows: {self.row_count}, max columns: {self.col_count}"
+            )
+        while len(self.cells) < last_row:
+            self.cells.append([])
+        for offset, row_values in enumerate(values):
+            row = self.cells[start_row - 1 + offset]
+            needed = start_col - 1 + len(row_values)
+            if len(row) < needed:
+                row.extend([""] * (needed - len(row)))
+            row[start_col - 1:needed] = [format_value(value) for value in row_values]
+
+    def last_data_row(self, start_col, end_col):
+        for row_number in range(len(self.cells), 0, -1):
+            if any(cell != "" for cell in self.cells[row_number - 1][start_col - 1:end_col]):
+                return row_number
+        return 0
+
+
+class FakeSpreadsheet:
+    def __init__(self, spreadsheet_id, title="Benchmark"):
+        self.id = spreadsheet_id
+        self.title = title
+        self.worksheets = []
+        self.revision = 0
+
+    def add_worksheet(self, title, rows=1000, cols=26):
+        worksheet = FakeWorksheet(len(self.worksheets), title, len(self.worksheets), rows, cols)
+        self.worksheets.append(worksheet)
+        return worksheet
+
+    def locate(self, range_name):
+        title, cells = split_range(range_name)
+        for worksheet in self.worksheets:
+            if title is None or worksheet.title == title:
+                return worksheet, cells
+        raise FakeError(400, f"Unable to parse range: {range_name}")
+
+    def modified_time(self):
+        stamp = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=self.revision)
+        return stamp.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+class FakeResponse:
+    """The parts of requests.Response that gspread reads"""
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode()
+        self.text = self.content.decode()
+        self.ok = 200 <= status_code < 300
+        self.headers = {"Content-Type": "application/json"}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSheetsBackend:
+    """Serves spreadsheets held in memory, counting calls and bytes per endpoint.
+
+    ``latency`` seconds are slept on every request; ``rate_limit_probability``
+    is the chance that a request is answered with a 429 instead, drawn
+    from a generator seeded with ``seed`` so runs are repeatable.
+    """
+    def __init__(self, latency=0.0, rate_limit_probability=0.0, seed=0):
+        self.latency = latency
+        self.rate_limit_probability = rate_limit_probability
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self.spreadsheets = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.calls = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.rate_limited = 0
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def create_spreadsheet(self, spreadsheet_id):
+        spreadsheet = FakeSpreadsheet(spreadsheet_id)
+        self.spreadsheets[spreadsheet_id] = spreadsheet
+        return spreadsheet
+
+    def session(self):
+        """A stand-in for the requests session gspread sends its requests through"""
+        return FakeSession(self)
+
+    def handle(self, method, url, params=None, json_body=None):
+        parsed = urlparse(url)
+        # Bytes as the client would put them on the wire: query plus JSON body
+        sent = len(parsed.query) + len(json.dumps(params or {}, default=str))
+        if json_body is not None:
+            sent += len(json.dumps(json_body).encode())
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self.bytes_sent += sent
+            try:
+                if self.rate_limit_probability and self._random.random() < self.rate_limit_probability:
+                    self.rate_limited += 1
+                    raise FakeError(429, "Quota exceeded for quota metric 'Read requests'")
+                endpoint, payload = self._dispatch(method.upper(), unquote(parsed.path), params or {}, json_body)
+                self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+                response = FakeResponse(200, payload)
+            except FakeError as e:
+                response = FakeResponse(e.status, {
+                    "error": {"code": e.status, "message": e.message, "status": _STATUSES.get(e.status, "UNKNOWN")}
+                })
+            self.bytes_received += len(response.content)
+            return response
+
+    def _spreadsheet(self, spreadsheet_id):
+        if spreadsheet_id not in self.spreadsheets:
+            raise FakeError(404, "Requested entity was not found.")
+        return self.spreadsheets[spreadsheet_id]
+
+    def _dispatch(self, method, path, params, body):
+        if path.startswith(DRIVE_PREFIX):
+            spreadsheet = self._spreadsheet(path[len(DRIVE_PREFIX):])
+            return "drive.get", {"id": spreadsheet.id, "modifiedTime": spreadsheet.modified_time()}
+
+        rest = path[len(SHEETS_PREFIX):]
+        if "/values" not in rest:
+            spreadsheet = self._spreadsheet(rest)
+            return "spreadsheets.get", {
+                "spreadsheetId": spreadsheet.id,
+                "properties": {"title": spreadsheet.title, "locale": "en_US", "timeZone": "Etc/GMT"},
+                "sheets": [{"properties": worksheet.properties()} for worksheet in spreadsheet.worksheets],
+            }
+
+        spreadsheet_id, values_path = rest.split("/values", 1)
+        spreadsheet = self._spreadsheet(spreadsheet_id)
+        if values_path == ":batchGet":
+            ranges = params.get("ranges", [])
+            value_ranges = []
+            for range_name in [ranges] if isinstance(ranges, str) else ranges:
+                worksheet, cells = spreadsheet.locate(range_name)
+                label, values = worksheet.read(cells)
+                value_range = {"range": label, "majorDimension": "ROWS"}
+                if values:
+                    value_range["values"] = values
+                value_ranges.append(value_range)
+            return "values.batchGet", {"spreadsheetId": spreadsheet.id, "valueRanges": value_ranges}
+
+        if values_path == ":batchUpdate":
+            total = 0
+            for update in body.get("data", []):
+                worksheet, cells = spreadsheet.locate(update["range"])
+                start_col, start_row, _, _ = worksheet.bounds(cells, clip=False)
+                worksheet.write(start_col, start_row, update["values"])
+                total += sum(len(row) for row in update["values"])
+            spreadsheet.revision += 1
+            return "values.batchUpdate", {"spreadsheetId": spreadsheet.id, "totalUpdatedCells": total}
+
+        range_name = values_path[1:]
+        if method == "GET":
+            worksheet, cells = spreadsheet.locate(range_name)
+            label, values = worksheet.read(cells)
+            payload = {"range": label, "majorDimension": "ROWS"}
+            if values:
+                payload["values"] = values
+            return "values.get", payload
+
+        if range_name.endswith(":append"):
+            worksheet, cells = spreadsheet.locate(range_name[:-len(":append")])
+            start_col, start_row, end_col, _ = worksheet.bounds(cells, clip=False)
+            values = body.get("values", [])
+            first_row = max(worksheet.last_data_row(start_col, end_col) + 1, start_row)
+            worksheet.row_count = max(worksheet.row_count, first_row + len(values) - 1)
+            worksheet.write(start_col, first_row, values)
+            spreadsheet.revision += 1
+            return "values.append", {"spreadsheetId": spreadsheet.id, "updates": {"updatedRows": len(values)}}
+
+        worksheet, cells = spreadsheet.locate(range_name)
+        start_col, start_row, _, _ = worksheet.bounds(cells, clip=False)
+        worksheet.write(start_col, start_row, body.get("values", []))
+        spreadsheet.revision += 1
+        return "values.update", {"spreadsheetId": spreadsheet.id, "updatedRange": range_name}
+
+
+class FakeSession:
+    def __init__(self, backend):
+        self.backend = backend
+        self.headers = {}
+
+    def request(self, method, url, json=None, params=None, **_options):
+        # data, files, headers and timeout mean nothing to the fake
+        return self.backend.handle(method, url, params=params, json_body=json)
+
+    def close(self):
+        pass
@@ -0,0 +1,268 @@
+"""
+Offline benchmarks of the Range hot paths against an in-process fake Sheets backend
+
+    python -m benchmarks.run --cells 1k,10k,100k --latency 0.02 --rate-limit 0.05
+    python -m benchmarks.run --compare benchmarks/results/<earlier run>.json
+
+Every case runs on a freshly loaded fake spreadsheet, so map always has the
+same work to do. Timings are the median of ``--repeat`` runs; API calls and
+bytes come from the backend's counters and peak memory from a separate run
+under tracemalloc (it includes the fake's response encoding, as a real
+response body would be).
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Optional
+
+import gspread
+from pydantic import BaseModel
+
+from tractable.connection_pool import SheetsConnectionPool
+from tractable.range import Range
+
+from .fake_backend import FakeSheetsBackend
+
+
+SPREADSHEET_ID = "benchmark"
+WORKSHEET_TITLE = "Data"
+RANGE_NAME = f"{WORKSHEET_TITLE}!A:H"
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+OPERATIONS = ("iter", "reduce", "map")
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+class Record(BaseModel):
+    id: int
+    name: str
+    email: str
+    score: float
+    quantity: int
+    active: bool
+    status: str
+    notes: Optional[str] = None
+
+
+HEADERS = list(Record.model_fields)
+STATUSES = ("pending", "shipped", "returned")
+
+
+def make_rows(count, seed=0):
+    """Deterministic data rows; every fourth row leaves its trailing notes cell blank"""
+    rng = random.Random(seed)
+    rows = []
+    for number in range(1, count + 1):
+        row = [
+            str(number),
+            f"Customer {number}",
+            f"customer{number}@example.com",
+            f"{rng.uniform(0, 100):.2f}",
+            str(rng.randint(0, 500)),
+            "TRUE" if rng.random() < 0.5 else "FALSE",
+            rng.choice(STATUSES),
+            "" if number % 4 == 0 else f"note {rng.randint(0, 10_000)}",
+        ]
+        while row and row[-1] == "":
+            row.pop()
+        rows.append(row)
+    return rows
+
+
+class FakePool(SheetsConnectionPool):
+    """Connection pool whose clients send every request to a FakeSheetsBackend"""
+    def __init__(self, backend, **pool_options):
+        self.backend = backend
+        super().__init__({}, **pool_options)
+
+    def _authorize(self, _service_account_dict):
+        return gspread.Client(None, session=self.backend.session())
+
+
+def total_quantity(total, item):
+    return total + (item.quantity if isinstance(item, Record) else int(item["quantity"]))
+
+
+def mark_shipped(item):
+    # Touches roughly a third of the rows, so map writes are a realistic mix
+    if isinstance(item, Record):
+        if item.status != "pending":
+            return None
+        item.status = "shipped"
+        return item
+    if item["status"] != "pending":
+        return None
+    item["status"] = "shipped"
+    return item
+
+
+def run_operation(range_, operation, model, chunk_rows):
+    if operation == "iter":
+        for _ in range_.iter(model, chunk_rows=chunk_rows):
+            pass
+    elif operation == "reduce":
+        range_.reduce(total_quantity, initial=0, model=model, chunk_rows=chunk_rows)
+    else:
+        range_.map(mark_shipped, model=model, chunk_rows=chunk_rows)
+
+
+def data_rows(cells):
+    return max(cells // len(HEADERS), 1)
+
+
+def prepare(cells, options):
+    """A backend loaded with about ``cells`` cells of data, and a Range over it"""
+    backend = FakeSheetsBackend(options.latency, options.rate_limit, options.seed)
+    worksheet = backend.create_spreadsheet(SPREADSHEET_ID).add_worksheet(WORKSHEET_TITLE)
+    worksheet.load([HEADERS] + make_rows(data_rows(cells), options.seed))
+
+    pool = FakePool(backend, initial_delay=options.retry_delay, max_retries=options.max_retries)
+    range_ = Range(pool.open_spreadsheet(SPREADSHEET_ID), RANGE_NAME)
+    # Worksheet metadata is cached by the pool; keep that one-off call out of the numbers
+    range_._get_worksheet()
+    backend.reset_stats()
+    return backend, range_
+
+
+def run_case(operation, model, cells, options):
+    timings = []
+    for _ in range(options.repeat):
+        backend, range_ = prepare(cells, options)
+        gc.collect()
+        start = time.perf_counter()
+        run_operation(range_, operation, model, options.chunk_rows)
+        timings.append(time.perf_counter() - start)
+
+    _, range_ = prepare(cells, options)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run_operation(range_, operation, model, options.chunk_rows)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    seconds = statistics.median(timings)
+    rows = data_rows(cells)
+    return {
+        "operation": operation,
+        "model": model is not None,
+        "cells": cells,
+        "rows": rows,
+        "seconds": round(seconds, 6),
+        "rows_per_sec": round(rows / seconds, 1) if seconds else None,
+        "api_calls": backend.total_calls,
+        "calls": dict(sorted(backend.calls.items())),
+        "rate_limited": backend.rate_limited,
+        "bytes_sent": backend.bytes_sent,
+        "bytes_received": backend.bytes_received,
+        "peak_memory_bytes": peak,
+    }
+
+
+def parse_sizes(text):
+    sizes = []
+    for part in text.split(","):
+        part = part.strip().lower()
+        if part in SIZES:
+            sizes.append(SIZES[part])
+        elif part.isdigit():
+            sizes.append(int(part))
+        else:
+            raise argparse.ArgumentTypeError(f"Unknown size {part!r}; use 1k, 10k, 100k, 1m or a cell count")
+    return sizes
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def case_key(result):
+    return result["operation"], result["model"], result["cells"]
+
+
+def print_results(results, baseline=None):
+    previous = {case_key(result): result for result in (baseline or {}).get("results", [])}
+    header = f"{'operation':<10}{'model':<7}{'cells':>10}{'rows/s':>12}{'calls':>7}{'sent':>11}{'received':>12}{'peak MB':>9}"
+    if previous:
+        header += f"{'vs base':>9}"
+    print(header)
+    for result in results:
+        line = (
+            f"{result['operation']:<10}{'yes' if result['model'] else 'no':<7}{result['cells']:>10}"
+            f"{result['rows_per_sec'] or 0:>12.0f}{result['api_calls']:>7}{result['bytes_sent']:>11}"
+            f"{result['bytes_received']:>12}{result['peak_memory_bytes'] / 2 ** 20:>9.1f}"
+        )
+        before = previous.get(case_key(result))
+        if before and before.get("rows_per_sec") and result["rows_per_sec"]:
+            line += f"{result['rows_per_sec'] / before['rows_per_sec']:>8.2f}x"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cells", type=parse_sizes, default=parse_sizes("1k,10k,100k"),
+                        help="comma-separated sheet sizes in cells: 1k, 10k, 100k, 1m or a number")
+    parser.add_argument("--operations", default=",".join(OPERATIONS), help="comma-separated subset of iter,reduce,map")
+    parser.add_argument("--models", choices=("both", "yes", "no"), default="both",
+                        help="run with a pydantic model, with plain dicts, or both")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="probability that a request gets a 429")
+    parser.add_argument("--retry-delay", type=float, default=0.01, help="initial backoff after a 429, in seconds")
+    parser.add_argument("--max-retries", type=int, default=8)
+    parser.add_argument("--chunk-rows", type=int, default=None, help="read in bands of this many rows")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the median is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="where to store the results (default: benchmarks/results/<time>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare rows/sec against")
+    options = parser.parse_args(argv)
+
+    operations = [operation.strip() for operation in options.operations.split(",")]
+    for operation in operations:
+        if operation not in OPERATIONS:
+            parser.error(f"unknown operation {operation!r}")
+    models = {"both": (None, Record), "yes": (Record,), "no": (None,)}[options.models]
+
+    results = []
+    for cells in options.cells:
+        for operation in operations:
+            for model in models:
+                results.append(run_case(operation, model, cells, options))
+
+    stamp = datetime.now(timezone.utc)
+    run = {
+        "created": stamp.isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": {key: value for key, value in vars(options).items() if key not in ("output", "compare")},
+        "results": results,
+    }
+    output = options.output or os.path.join(RESULTS_DIR, stamp.strftime("%Y%m%dT%H%M%SZ") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as results_file:
+        json.dump(run, results_file, indent=2)
+
+    baseline = None
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_results(results, baseline)
+    print(f"\nResults stored in {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Test single-read aggregates over ranges
+"""
+import math
+import pytest
+from tractable import Spreadsheet
+from tractable import columns as columns_module
+from tractable.aggregate import compute_aggregates, plan_columns
+from tractable.columns import read_columns
+from tests.helpers import get_test_credentials, get_test_sheet_id, create_test_worksheet, cleanup_test_worksheet
+
+
+HEADERS = ["region", "amount", "customer"]
+ROWS = [["N", "10", "a"], ["S", "5", "b"], ["N", "", "a"], ["N", "7", "c"], ["S", "1,000"]]
+AGGREGATES = {
+    "total": ("amount", "sum"),
+    "sales": ("amount", "count"),
+    "low": ("amount", "min"),
+    "high": ("amount", "max"),
+    "average": ("amount", "mean"),
+    "customers": ("customer", "distinct"),
+}
+
+
+def aggregate(group_by=()):
+    dtypes = plan_columns(AGGREGATES, group_by)
+    buffers = read_columns(HEADERS, enumerate(ROWS), dtypes, list(dtypes))
+    return compute_aggregates(buffers, AGGREGATES, group_by)
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(columns_module, "np", None)
+
+
+@pytest.mark.usefixtures("backend")
+def test_aggregates_without_grouping():
+    assert aggregate() == {
+        "total": 1022.0, "sales": 4, "low": 5.0, "high": 1000.0, "average": 255.5, "customers": 3
+    }
+
+
+@pytest.mark.usefixtures("backend")
+def test_aggregates_grouped_in_order_of_first_appearance():
+    result = aggregate(["region"])
+
+    assert list(result) == ["N", "S"]
+    assert result["N"] == {"total": 17.0, "sales": 2, "low": 7.0, "high": 10.0, "average": 8.5, "customers": 2}
+    assert result["S"]["customers"] == 1
+
+    by_pair = aggregate(["region", "customer"])
+    assert list(by_pair) == [("N", "a"), ("S", "b"), ("N", "c"), ("S", "")]
+    assert by_pair[("N", "a")]["sales"] == 1
+
+
+@pytest.mark.usefixtures("backend")
+def test_aggregates_of_no_rows():
+    dtypes = plan_columns(AGGREGATES, [])
+    result = compute_aggregates(read_columns(HEADERS, iter(()), dtypes, list(dtypes)), AGGREGATES)
+
+    assert result["total"] == 0.0 and result["sales"] == 0 and result["customers"] == 0
+    assert math.isnan(result["average"]) and math.isnan(result["low"])
+
+
+def test_unknown_aggregate_function_is_rejected():
+    with pytest.raises(ValueError):
+        plan_columns({"total": ("amount", "median")}, [])
+
+
+def test_range_aggregate_reads_once():
+    worksheet = create_test_worksheet("AggregateTest", rows=20, cols=3)
+    worksheet.update([HEADERS] + ROWS, "A1:C6")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    totals = sheet.range("AggregateTest!A:C").aggregate(total=("amount", "sum"), sales=("amount", "count"))
+    by_region = sheet.range("AggregateTest!A:C").aggregate("region", total=("amount", "sum"), chunk_rows=2)
+    
+    assert totals == {"total": 1022.0, "sales": 4}
+    assert by_region == {"N": {"total": 17.0}, "S": {"total": 1005.0}}
+    
+    cleanup_test_worksheet("AggregateTest")
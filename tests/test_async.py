@@ -0,0 +1,87 @@
+"""
+Test the asyncio API: Range.aiter, Range.amap and Range.areduce
+"""
+import asyncio
+import pytest
+from pydantic import BaseModel
+from tractable import Spreadsheet
+from tests.helpers import get_test_credentials, get_test_sheet_id, create_test_worksheet, cleanup_test_worksheet
+
+
+class Product(BaseModel):
+    name: str
+    price: float
+    quantity: int
+
+
+@pytest.mark.asyncio
+async def test_aiter_and_areduce():
+    worksheet = create_test_worksheet("AsyncReadTest", rows=10, cols=3)
+    worksheet.update([
+        ["name", "price", "quantity"],
+        ["Apple", "1.50", "10"],
+        ["Banana", "0.75", "15"],
+        ["Orange", "2.00", "8"],
+        ["", "", ""],
+        ["Grape", "3.50", "5"]
+    ], "A1:C6")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    products = [product async for product in sheet.range("AsyncReadTest!A:C").aiter(Product)]
+    assert [product.name for product in products] == ["Apple", "Banana", "Orange"]
+    
+    rows = [row async for row in sheet.range("AsyncReadTest!A:C").aiter(chunk_rows=2)]
+    assert rows[2] == {"name": "Orange", "price": "2.00", "quantity": "8"}
+    
+    total = await sheet.range("AsyncReadTest!A:C").areduce(
+        lambda acc, product: acc + product.price * product.quantity,
+        initial=0.0,
+        model=Product
+    )
+    assert total == (1.50 * 10) + (0.75 * 15) + (2.00 * 8)
+    
+    await sheet.aclose()
+    cleanup_test_worksheet("AsyncReadTest")
+
+
+@pytest.mark.asyncio
+async def test_amap_with_coroutine_transform():
+    worksheet = create_test_worksheet("AsyncMapTest", rows=10, cols=3)
+    worksheet.update([
+        ["name", "price", "quantity"],
+        ["Apple", "1.5", "10"],
+        ["Banana", "0.75", "15"],
+    ], "A1:C3")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    async def restock(product: Product) -> Product:
+        await asyncio.sleep(0)
+        product.quantity += 100
+        return product
+    
+    report = await sheet.range("AsyncMapTest!A:C").amap(restock, model=Product)
+    
+    assert report.ok
+    assert worksheet.get("C2:C3") == [["110"], ["115"]]
+    
+    await sheet.aclose()
+    cleanup_test_worksheet("AsyncMapTest")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_async_reads():
+    worksheet = create_test_worksheet("AsyncConcurrentTest", rows=10, cols=2)
+    worksheet.update([["name", "score"], ["Alice", "95"], ["Bob", "87"]], "A1:B3")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    async def count_rows():
+        return await sheet.range("AsyncConcurrentTest!A:B").areduce(lambda acc, _row: acc + 1, initial=0)
+    
+    counts = await asyncio.gather(*(count_rows() for _ in range(5)))
+    assert counts == [2] * 5
+    
+    await sheet.aclose()
+    cleanup_test_worksheet("AsyncConcurrentTest")
@@ -0,0 +1,146 @@
+"""
+Test streaming iteration over ranges in row bands
+"""
+import pytest
+from pydantic import BaseModel
+from tractable import Spreadsheet
+from tests.helpers import (
+    get_test_credentials, get_test_sheet_id, get_gspread_client, create_test_worksheet, cleanup_test_worksheet
+)
+
+
+class Item(BaseModel):
+    name: str
+    quantity: int
+
+
+def test_chunked_iter_matches_full_read():
+    worksheet = create_test_worksheet("ChunkedIterTest", rows=30, cols=2)
+    test_data = [["name", "quantity"]] + [[f"item{i}", str(i)] for i in range(1, 12)]
+    worksheet.update(test_data, "A1:B12")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    full = list(sheet.range("ChunkedIterTest!A:B").iter())
+    chunked = list(sheet.range("ChunkedIterTest!A:B").iter(chunk_rows=4))
+    
+    assert len(chunked) == 11
+    assert chunked == full
+    assert chunked[0] == {"name": "item1", "quantity": "1"}
+    assert chunked[-1] == {"name": "item11", "quantity": "11"}
+    
+    cleanup_test_worksheet("ChunkedIterTest")
+
+
+def test_chunked_iter_stops_at_first_blank_row():
+    worksheet = create_test_worksheet("ChunkedBlankTest", rows=30, cols=2)
+    worksheet.update([
+        ["name", "quantity"],
+        ["Apple", "10"],
+        ["Banana", "15"],
+        ["Cherry", "8"],
+        ["", ""],
+        ["Damson", "5"],
+    ], "A1:B6")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    items = list(sheet.range("ChunkedBlankTest!A:B").iter(Item, chunk_rows=2))
+    
+    assert [item.name for item in items] == ["Apple", "Banana", "Cherry"]
+    assert isinstance(items[0], Item)
+    
+    total = sheet.range("ChunkedBlankTest!A:B").reduce(
+        lambda acc, item: acc + item.quantity,
+        initial=0,
+        model=Item,
+        chunk_rows=2
+    )
+    assert total == 33
+    
+    cleanup_test_worksheet("ChunkedBlankTest")
+
+
+def test_chunked_iter_rejects_invalid_chunk_size():
+    worksheet = create_test_worksheet("ChunkedInvalidTest", rows=5, cols=2)
+    worksheet.update([["name", "quantity"], ["Apple", "10"]], "A1:B2")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    with pytest.raises(ValueError):
+        list(sheet.range("ChunkedInvalidTest!A:B").iter(chunk_rows=0))
+    
+    cleanup_test_worksheet("ChunkedInvalidTest")
+
+
+def test_chunked_iter_with_prefetch():
+    worksheet = create_test_worksheet("PrefetchIterTest", rows=30, cols=2)
+    test_data = [["name", "quantity"]] + [[f"item{i}", str(i)] for i in range(1, 12)]
+    worksheet.update(test_data, "A1:B12")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    items = list(sheet.range("PrefetchIterTest!A:B").iter(Item, chunk_rows=3, prefetch=2))
+    assert [item.quantity for item in items] == list(range(1, 12))
+    
+    # Closing the generator early must not leave the worker blocked
+    partial = sheet.range("PrefetchIterTest!A:B").iter(Item, chunk_rows=3, prefetch=1)
+    assert next(partial).name == "item1"
+    partial.close()
+    
+    with pytest.raises(ValueError):
+        list(sheet.range("PrefetchIterTest!A:B").iter(prefetch=2))
+    
+    cleanup_test_worksheet("PrefetchIterTest")
+
+
+def test_chunked_reads_follow_grid_grown_by_another_client():
+    worksheet = create_test_worksheet("ChunkedGrowTest", rows=3, cols=2)
+    worksheet.update([["name", "quantity"], ["Apple", "10"], ["Banana", "15"]], "A1:B3")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    assert len(list(sheet.range("ChunkedGrowTest!A:B").iter(chunk_rows=2))) == 2
+    
+    # Grow the grid behind the pool's back, while its worksheet metadata is still cached
+    other = get_gspread_client().client.open_by_key(get_test_sheet_id()).worksheet("ChunkedGrowTest")
+    other.append_rows([["Cherry", "8"], ["Damson", "5"]], table_range="A1:B3")
+    
+    names = ["Apple", "Banana", "Cherry", "Damson"]
+    assert [item.name for item in sheet.range("ChunkedGrowTest!A:B").iter(Item, chunk_rows=2)] == names
+    projected = sheet.range("ChunkedGrowTest!A:B").iter(Item, chunk_rows=2, project=True)
+    assert [item.name for item in projected] == names
+    
+    total = sheet.range("ChunkedGrowTest!A:B").reduce(
+        lambda acc, item: acc + item.quantity,
+        initial=0,
+        model=Item,
+        chunk_rows=2
+    )
+    assert total == 38
+    
+    def restock(item):
+        item.quantity += 1
+        return item
+    
+    sheet.range("ChunkedGrowTest!A:B").map(restock, model=Item, chunk_rows=2)
+    assert worksheet.get("B2:B5") == [["11"], ["16"], ["9"], ["6"]]
+    
+    cleanup_test_worksheet("ChunkedGrowTest")
+
+
+@pytest.mark.asyncio
+async def test_async_chunked_reads_follow_grid_grown_by_another_client():
+    worksheet = create_test_worksheet("AsyncGrowTest", rows=3, cols=2)
+    worksheet.update([["name", "quantity"], ["Apple", "10"], ["Banana", "15"]], "A1:B3")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    assert len([row async for row in sheet.range("AsyncGrowTest!A:B").aiter(chunk_rows=2)]) == 2
+    
+    other = get_gspread_client().client.open_by_key(get_test_sheet_id()).worksheet("AsyncGrowTest")
+    other.append_rows([["Cherry", "8"], ["Damson", "5"]], table_range="A1:B3")
+    
+    rows = [row async for row in sheet.range("AsyncGrowTest!A:B").aiter(chunk_rows=2)]
+    assert [row["name"] for row in rows] == ["Apple", "Banana", "Cherry", "Damson"]
+    
+    await sheet.aclose()
+    cleanup_test_worksheet("AsyncGrowTest")
@@ -0,0 +1,147 @@
+"""
+Test compiled row encoding and decoding between pydantic models and sheet rows
+"""
+from enum import Enum
+from typing import Optional
+import pytest
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PlainSerializer,
+    ValidationError,
+    WrapSerializer,
+    computed_field,
+    field_serializer,
+)
+from typing_extensions import Annotated
+from tractable.codec import compile_row_decoder, compile_row_encoder
+from tractable.range import model_to_row
+
+
+class Color(Enum):
+    RED = "red"
+
+
+class Address(BaseModel):
+    city: str
+
+
+class Person(BaseModel):
+    name: str
+    email_address: str = Field(alias="Email")
+    score: Optional[float] = None
+    color: Color = Color.RED
+    address: Optional[Address] = None
+    secret: str = Field(default="hidden", exclude=True)
+    joined: str = "2024-01-01"
+
+    @field_serializer("joined")
+    def serialize_joined(self, value):
+        return value.replace("-", "/")
+
+    @computed_field
+    @property
+    def initials(self) -> str:
+        return self.name[:1]
+
+
+def test_model_to_row_follows_headers():
+    person = Person(name="Alice", Email="alice@example.com", score=9.5, address=Address(city="Oslo"))
+    headers = ["Email", "name", "score", "color", "address", "secret", "joined", "initials", "missing"]
+
+    assert model_to_row(person, headers) == [
+        "alice@example.com",
+        "Alice",
+        "9.5",
+        "Color.RED",
+        "{'city': 'Oslo'}",
+        "",
+        "2024/01/01",
+        "A",
+        "",
+    ]
+
+
+def test_model_to_row_writes_none_as_empty_cell():
+    person = Person(name="Bob", Email="bob@example.com")
+
+    assert model_to_row(person, ["name", "score", "address"]) == ["Bob", "", ""]
+
+
+def test_model_to_row_includes_extra_fields_when_allowed():
+    class Loose(BaseModel):
+        model_config = ConfigDict(extra="allow")
+        name: str
+
+    assert model_to_row(Loose(name="Cy", team="Red"), ["team", "name", "city"]) == ["Red", "Cy", ""]
+
+
+Price = Annotated[float, PlainSerializer(lambda value: f"{value:.2f}")]
+
+
+class Product(BaseModel):
+    price: Price
+    discount: Optional[Price] = None
+    code: Annotated[str, WrapSerializer(lambda value, handler: handler(value).upper())]
+    quantity: int
+
+
+def test_model_to_row_applies_annotated_serializers():
+    product = Product(price=1.5, discount=0.25, code="ab", quantity=3)
+
+    assert model_to_row(product, ["price", "discount", "code", "quantity"]) == ["1.50", "0.25", "AB", "3"]
+
+
+def test_row_encoder_is_compiled_once_per_model_and_headers():
+    headers = ("name", "Email")
+
+    assert compile_row_encoder(Person, headers) is compile_row_encoder(Person, headers)
+    assert compile_row_encoder(Person, headers) is not compile_row_encoder(Person, ("name",))
+
+
+class Member(BaseModel):
+    name: str
+    email_address: str = Field(alias="Email")
+    score: Optional[float] = None
+
+
+def test_row_decoder_maps_columns_to_fields():
+    decoder = compile_row_decoder(Member, ("Email", "notes", "name", "score"))
+
+    members = list(decoder.decode([
+        ["alice@example.com", "ignored", "Alice", "9.5"],
+        ["bob@example.com", "", "Bob", ""],
+        ["cy@example.com", "", "Cy"],
+    ]))
+
+    assert members == [
+        Member(name="Alice", Email="alice@example.com", score=9.5),
+        Member(name="Bob", Email="bob@example.com"),
+        Member(name="Cy", Email="cy@example.com"),
+    ]
+
+
+def test_row_decoder_yields_rows_before_an_invalid_one():
+    decoder = compile_row_decoder(Member, ("name", "Email", "score"))
+    members = decoder.decode([
+        ["Alice", "alice@example.com", "9.5"],
+        ["Bob", "bob@example.com", "not a number"],
+    ])
+
+    assert next(members).name == "Alice"
+    with pytest.raises(ValidationError):
+        next(members)
+
+
+def test_row_decoder_runs_custom_init():
+    class Tagged(BaseModel):
+        name: str
+        tag: str = ""
+
+        def __init__(self, **data):
+            super().__init__(tag="seen", **data)
+
+    decoder = compile_row_decoder(Tagged, ("name",))
+
+    assert [item.tag for item in decoder.decode([["A"], ["B"]])] == ["seen", "seen"]
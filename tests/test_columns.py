@@ -0,0 +1,78 @@
+"""
+Test columnar reads into NumPy arrays or array.array buffers
+"""
+import array
+import math
+import pytest
+from tractable import Spreadsheet
+from tractable import columns as columns_module
+from tractable.columns import parse_column, read_columns
+from tests.helpers import get_test_credentials, get_test_sheet_id, create_test_worksheet, cleanup_test_worksheet
+
+
+@pytest.fixture
+def without_numpy(monkeypatch):
+    monkeypatch.setattr(columns_module, "np", None)
+
+
+@pytest.mark.usefixtures("without_numpy")
+def test_parse_column_without_numpy():
+    floats = parse_column(["1.5", "", "1,000"], float)
+    assert isinstance(floats, array.array)
+    assert floats[0] == 1.5 and math.isnan(floats[1]) and floats[2] == 1000.0
+
+    assert parse_column(["3", "4"], int) == array.array("q", [3, 4])
+    assert parse_column(["TRUE", "false", ""], bool) == array.array("b", [1, 0, 0])
+    assert parse_column(["a", ""], str) == ["a", ""]
+
+    with pytest.raises(ValueError):
+        parse_column(["1", ""], int)
+
+
+def test_parse_column_with_numpy():
+    np = pytest.importorskip("numpy")
+
+    floats = parse_column(["1.5", "", "1,000"], float)
+    assert floats.dtype == np.float64
+    assert floats[0] == 1.5 and np.isnan(floats[1]) and floats[2] == 1000.0
+
+    assert parse_column(["3", "4"], "int32").dtype == np.int32
+    assert parse_column(["TRUE", "FALSE", ""], bool).tolist() == [True, False, False]
+
+    with pytest.raises(ValueError):
+        parse_column(["yes"], bool)
+
+
+@pytest.mark.usefixtures("without_numpy")
+def test_read_columns_joins_bands_and_pads_short_rows():
+    rows = enumerate([["a", "1"], ["b"], ["c", "3"]], start=2)
+
+    result = read_columns(["name", "score"], rows, {"score": float}, ["name", "score"], batch_rows=2)
+
+    assert result["name"] == ["a", "b", "c"]
+    assert result["score"][0] == 1.0 and math.isnan(result["score"][1]) and result["score"][2] == 3.0
+
+
+def test_to_columns_reads_typed_columns():
+    worksheet = create_test_worksheet("ColumnsTest", rows=20, cols=3)
+    worksheet.update([
+        ["name", "quantity", "price"],
+        ["Apple", "10", "1.25"],
+        ["Banana", "15", ""],
+        ["Cherry", "8", "3.5"],
+        ["", "", ""],
+        ["Damson", "5", "2"],
+    ], "A1:C6")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    result = sheet.range("ColumnsTest!A:C").to_columns({"quantity": int, "price": float})
+    chunked = sheet.range("ColumnsTest!A:C").to_columns({"quantity": int}, columns=["name", "quantity"], chunk_rows=2)
+    
+    assert list(result) == ["quantity", "price"]
+    assert list(result["quantity"]) == [10, 15, 8]
+    assert result["price"][0] == 1.25 and math.isnan(result["price"][1])
+    assert list(chunked["name"]) == ["Apple", "Banana", "Cherry"]
+    assert list(chunked["quantity"]) == [10, 15, 8]
+    
+    cleanup_test_worksheet("ColumnsTest")
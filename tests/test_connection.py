@@ -2,8 +2,10 @@
 
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from tractable.connection_pool import get_connection_pool
+from tractable.connection_pool import SheetsConnectionPool, get_connection_pool
 
 
 def test_connection():
@@ -36,3 +38,57 @@ def test_connection():
     assert result == test_data
     assert result[0] == ["name", "email", "score"]
     assert result[1][0] == "Alice"
+
+
+def test_connection_pool_with_multiple_clients():
+    load_dotenv()
+
+    creds_data = json.loads(os.getenv("GOOGLE_SHEETS_CREDS_JSON"))
+    sheet_id = os.getenv("TEST_SHEET_ID")
+
+    pool = SheetsConnectionPool(creds_data, pool_size=3)
+    sheet = pool.open_spreadsheet(sheet_id)
+    assert pool.open_spreadsheet(sheet_id) is sheet
+
+    worksheet = sheet.sheet1
+    worksheet.clear()
+    worksheet.update([["name", "score"], ["Alice", "95"], ["Bob", "87"]], "A1:B3")
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(lambda _: worksheet.get("A1:B3"), range(12)))
+
+    assert all(result == [["name", "score"], ["Alice", "95"], ["Bob", "87"]] for result in results)
+
+    # Every client went back to the pool, and each has its own session
+    checked_out = []
+    for _ in range(3):
+        checked_out.append(pool._idle_clients.get_nowait())
+    assert len({id(client.http_client.session) for client in checked_out}) == 3
+    for client in checked_out:
+        pool._idle_clients.put(client)
+
+
+def test_execute_with_retry_leaves_clients_to_proxy_calls():
+    load_dotenv()
+
+    creds_data = json.loads(os.getenv("GOOGLE_SHEETS_CREDS_JSON"))
+    sheet_id = os.getenv("TEST_SHEET_ID")
+
+    pool = SheetsConnectionPool(creds_data, pool_size=1)
+    sheet = pool.open_spreadsheet(sheet_id)
+    worksheet = sheet.sheet1
+    worksheet.clear()
+    worksheet.update([["name"], ["Alice"]], "A1:A2")
+
+    # The proxy call needs the pool's only client; run it on a daemon thread
+    # so a regression fails on the timeout instead of hanging the suite
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(
+            pool.execute_with_retry(lambda: pool.open_spreadsheet(sheet_id).sheet1.get("A1:A2"))
+        ),
+        daemon=True
+    )
+    thread.start()
+    thread.join(timeout=30)
+    assert results == [[["name"], ["Alice"]]]
@@ -3,6 +3,8 @@ Test iterating over ranges in dict mode
 """
 import pytest
 from tractable import Spreadsheet
+from gspread.http_client import HTTPClient
+from tractable.connection_pool import SpreadsheetProxy
 from tests.helpers import get_test_credentials, get_test_sheet_id, get_gspread_client
 
 
@@ -111,4 +113,74 @@ def test_iterate_empty_range_returns_empty():
     for row in spreadsheet.range("Sheet1!A1:D1").iter():
         collected_rows.append(row)
     
-    assert len(collected_rows) == 0
\ No newline at end of file
+    assert len(collected_rows) == 0
+
+def test_batch_iter_reads_many_ranges_in_one_request(monkeypatch):
+    service_account_dict = get_test_credentials()
+    sheet_id = get_test_sheet_id()
+    
+    gspread_client = get_gspread_client()
+    sheet = gspread_client.open_spreadsheet(sheet_id)
+    
+    worksheet = sheet.sheet1
+    worksheet.clear()
+    worksheet.update([
+        ["name", "score", "", "team", "city"],
+        ["Alice", "95", "", "Red", "Oslo"],
+        ["Bob", "87", "", "Blue", "Lima"],
+    ], "A1:E3")
+    
+    spreadsheet = Spreadsheet(service_account_dict, sheet_id)
+    
+    calls = []
+    original_batch_get = SpreadsheetProxy.batch_get
+    
+    def counting_batch_get(self, range_names):
+        calls.append(list(range_names))
+        return original_batch_get(self, range_names)
+    
+    monkeypatch.setattr(SpreadsheetProxy, "batch_get", counting_batch_get)
+    
+    scores, teams, empty = spreadsheet.batch_iter(["Sheet1!A1:B3", "D1:E3", "Sheet1!G1:H3"])
+    
+    assert len(calls) == 1
+    assert list(scores) == [{"name": "Alice", "score": "95"}, {"name": "Bob", "score": "87"}]
+    assert list(teams) == [{"team": "Red", "city": "Oslo"}, {"team": "Blue", "city": "Lima"}]
+    assert list(empty) == []
+
+
+def test_worksheet_metadata_is_cached(monkeypatch):
+    service_account_dict = get_test_credentials()
+    sheet_id = get_test_sheet_id()
+    
+    gspread_client = get_gspread_client()
+    sheet = gspread_client.open_spreadsheet(sheet_id)
+    
+    worksheet = sheet.sheet1
+    worksheet.clear()
+    worksheet.update([
+        ["name", "score"],
+        ["Alice", "95"],
+    ], "A1:B2")
+    
+    spreadsheet = Spreadsheet(service_account_dict, sheet_id)
+    spreadsheet.spreadsheet.invalidate()
+    list(spreadsheet.range("Sheet1!A1:B2").iter())
+    
+    requests = []
+    original_request = HTTPClient.request
+    
+    def counting_request(self, method, endpoint, *args, **kwargs):
+        requests.append(endpoint)
+        return original_request(self, method, endpoint, *args, **kwargs)
+    
+    monkeypatch.setattr(HTTPClient, "request", counting_request)
+    
+    assert list(spreadsheet.range("Sheet1!A1:B2").iter()) == [{"name": "Alice", "score": "95"}]
+    assert list(spreadsheet.range("A1:B2").iter()) == [{"name": "Alice", "score": "95"}]
+    assert len(requests) == 2
+    assert all("/values/" in endpoint for endpoint in requests)
+    
+    spreadsheet.spreadsheet.invalidate()
+    list(spreadsheet.range("Sheet1!A1:B2").iter())
+    assert len(requests) == 4
@@ -0,0 +1,70 @@
+"""
+Test appending rows with Range.extend
+"""
+from pydantic import BaseModel
+from tractable import Spreadsheet
+from tractable.connection_pool import WorksheetProxy
+from tests.helpers import get_test_credentials, get_test_sheet_id, create_test_worksheet, cleanup_test_worksheet
+
+
+class Item(BaseModel):
+    name: str
+    quantity: int
+
+
+def test_extend_appends_generated_rows_in_bounded_chunks(monkeypatch):
+    worksheet = create_test_worksheet("ExtendTest", rows=5, cols=3)
+    worksheet.update([
+        ["name", "quantity", "notes"],
+        ["Apple", "10", "fresh"],
+    ], "A1:C2")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    appends = []
+    original_append_rows = WorksheetProxy.append_rows
+    
+    def counting_append_rows(self, values, *args, **kwargs):
+        appends.append(len(values))
+        return original_append_rows(self, values, *args, **kwargs)
+    
+    monkeypatch.setattr(WorksheetProxy, "append_rows", counting_append_rows)
+    
+    def items():
+        for number in range(5):
+            yield Item(name=f"Item {number}", quantity=number)
+    
+    appended = sheet.range("ExtendTest!A:C").extend(items(), max_batch_cells=6)
+    assert appended == 5
+    assert appends == [2, 2, 1]
+    
+    appended = sheet.range("ExtendTest!A:C").extend([{"name": "Pear", "quantity": "3", "notes": "ripe"}], model=Item)
+    assert appended == 1
+    
+    values = worksheet.get("A1:C8")
+    assert values[1] == ["Apple", "10", "fresh"]
+    assert values[2][:2] == ["Item 0", "0"]
+    assert values[6][:2] == ["Item 4", "4"]
+    assert values[7][:2] == ["Pear", "3"]
+    
+    raw = sheet.range("ExtendTest!A:C").extend([{"name": "Plum", "notes": "late"}])
+    assert raw == 1
+    assert worksheet.get("A9:C9") == [["Plum", "", "late"]]
+    
+    cleanup_test_worksheet("ExtendTest")
+
+
+def test_chunked_read_after_extend_stays_inside_grid():
+    worksheet = create_test_worksheet("ExtendGridTest", rows=6, cols=2)
+    worksheet.update([["name", "quantity"], ["Apple", "10"], ["Banana", "15"]], "A1:B3")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    # Fills the grid exactly, so it does not grow; the cached row count must not either
+    items = [Item(name=name, quantity=number) for number, name in enumerate(["Cherry", "Damson", "Elder"])]
+    assert sheet.range("ExtendGridTest!A:B").extend(items) == 3
+    
+    rows = list(sheet.range("ExtendGridTest!A:B").iter(Item, chunk_rows=2))
+    assert [item.name for item in rows] == ["Apple", "Banana", "Cherry", "Damson", "Elder"]
+    
+    cleanup_test_worksheet("ExtendGridTest")
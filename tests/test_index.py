@@ -0,0 +1,110 @@
+"""
+Test keyed lookups with Range.index
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import BaseModel, field_validator
+from tractable import Spreadsheet
+from tractable import index as index_module
+from tractable.range import Range
+from tractable.connection_pool import WorksheetProxy
+from tests.helpers import get_test_credentials, get_test_sheet_id, create_test_worksheet, cleanup_test_worksheet
+
+
+validated = []
+
+
+class Product(BaseModel):
+    sku: str
+    price: float
+    
+    @field_validator("sku")
+    @classmethod
+    def record_validation(cls, value):
+        validated.append(value)
+        return value
+
+
+def test_index_reads_once_and_validates_on_lookup(monkeypatch):
+    worksheet = create_test_worksheet("IndexTest", rows=10, cols=2)
+    worksheet.update([
+        ["sku", "price"],
+        ["A-1", "9.5"],
+        ["B-2", "12"],
+        ["", "1"],
+        ["A-1", "99"],
+    ], "A1:B5")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    reads = []
+    original_get = WorksheetProxy.get
+    
+    def counting_get(self, *args, **kwargs):
+        reads.append(args)
+        return original_get(self, *args, **kwargs)
+    
+    monkeypatch.setattr(WorksheetProxy, "get", counting_get)
+    
+    validated.clear()
+    products = sheet.range("IndexTest!A:B").index("sku", model=Product)
+    assert len(reads) == 1
+    assert validated == []
+    
+    assert len(products) == 2
+    assert "B-2" in products and "C-3" not in products
+    assert products["A-1"] == Product(sku="A-1", price=9.5)
+    assert products.get("C-3") is None
+    assert products.row_number("B-2") == 3
+    assert products["A-1"] is products["A-1"]
+    assert validated == ["A-1", "A-1"]
+    assert len(reads) == 1
+    
+    worksheet.update([["C-3", "4"]], "A4:B4")
+    assert "C-3" not in products
+    products.refresh()
+    assert products["C-3"].price == 4.0
+    assert len(reads) == 2
+    
+    as_dicts = sheet.range("IndexTest!A:B").index("sku", ttl=0)
+    assert as_dicts["B-2"] == {"sku": "B-2", "price": "12"}
+    assert len(reads) == 4
+    
+    cleanup_test_worksheet("IndexTest")
+
+
+def test_expired_index_is_reread_once_for_concurrent_lookups(monkeypatch):
+    worksheet = create_test_worksheet("IndexThreadTest", rows=10, cols=2)
+    worksheet.update([["sku", "price"], ["A-1", "9.5"], ["B-2", "12"]], "A1:B3")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    products = sheet.range("IndexThreadTest!A:B").index("sku", model=Product, ttl=60)
+    
+    reads = []
+    original_source_rows = Range._source_rows
+    
+    def slow_source_rows(self, *args, **kwargs):
+        reads.append(None)
+        time.sleep(0.1)
+        return original_source_rows(self, *args, **kwargs)
+    
+    monkeypatch.setattr(Range, "_source_rows", slow_source_rows)
+    worksheet.update([["A-1", "10"], ["C-3", "4"]], "A2:B3")
+    
+    started = time.monotonic()
+    monkeypatch.setattr(index_module.time, "monotonic", lambda: started + 120)
+    
+    barrier = threading.Barrier(8)
+    
+    def look_up(_):
+        barrier.wait()
+        return products["A-1"].price, "C-3" in products, "B-2" in products
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(look_up, range(8)))
+    
+    assert results == [(10.0, True, False)] * 8
+    assert len(reads) == 1
+    
+    cleanup_test_worksheet("IndexThreadTest")
@@ -5,7 +5,14 @@ Test map functionality for updating ranges
 import pytest
 from pydantic import BaseModel, Field
 from tractable import Spreadsheet
-from tests.helpers import get_test_credentials, get_test_sheet_id, get_gspread_client
+from tractable.connection_pool import WorksheetProxy
+from tests.helpers import (
+    get_test_credentials,
+    get_test_sheet_id,
+    get_gspread_client,
+    create_test_worksheet,
+    cleanup_test_worksheet,
+)
 
 
 class User(BaseModel):
@@ -261,3 +268,227 @@ def test_another_map_case():
     assert updated_values[1][1] == "10000"
     assert updated_values[2][1] == "10000"
     assert updated_values[3][1] == "10000"
+
+
+def test_map_only_writes_changed_cells(monkeypatch):
+    service_account_dict = get_test_credentials()
+    sheet_id = get_test_sheet_id()
+
+    gspread_client = get_gspread_client()
+    sheet = gspread_client.open_spreadsheet(sheet_id)
+
+    worksheet = sheet.sheet1
+    worksheet.clear()
+
+    test_data = [
+        ["name", "email", "status"],
+        ["Alice", "alice@example.com", "pending"],
+        ["Bob", "bob@example.com", "done"],
+        ["Charlie", "charlie@example.com", "pending"],
+    ]
+    worksheet.update(test_data, "A1:C4")
+
+    spreadsheet = Spreadsheet(service_account_dict, sheet_id)
+
+    sent_updates = []
+    original_batch_update = WorksheetProxy.batch_update
+
+    def recording_batch_update(self, updates):
+        sent_updates.extend(dict(update) for update in updates)
+        return original_batch_update(self, updates)
+
+    monkeypatch.setattr(WorksheetProxy, "batch_update", recording_batch_update)
+
+    def finish(row: dict) -> dict:
+        row["status"] = "done"
+        return row
+
+    spreadsheet.range("Sheet1!A1:C4").map(finish)
+
+    # Bob's row is returned unchanged, so only two status cells are written
+    assert sent_updates == [
+        {"range": "C2:C2", "values": [["done"]]},
+        {"range": "C4:C4", "values": [["done"]]},
+    ]
+
+    updated_values = worksheet.get("A1:C4")
+    assert [row[2] for row in updated_values[1:]] == ["done", "done", "done"]
+
+    sent_updates.clear()
+    spreadsheet.range("Sheet1!A1:C4").map(lambda row: row)
+    assert sent_updates == []
+
+
+def test_map_coalesces_consecutive_rows_into_blocks(monkeypatch):
+    worksheet = create_test_worksheet("MapCoalesceTest", rows=10, cols=28)
+
+    headers = [f"col{i}" for i in range(1, 29)]
+    test_data = [headers] + [[f"r{row}c{col}" for col in range(1, 29)] for row in range(1, 6)]
+    worksheet.update(test_data, "A1:AB6")
+
+    spreadsheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+
+    sent_updates = []
+    original_batch_update = WorksheetProxy.batch_update
+
+    def recording_batch_update(self, updates):
+        sent_updates.extend(dict(update) for update in updates)
+        return original_batch_update(self, updates)
+
+    monkeypatch.setattr(WorksheetProxy, "batch_update", recording_batch_update)
+
+    def touch_wide_columns(row: dict) -> dict:
+        if row["col1"] == "r5c1":
+            return None
+        row["col27"] = "x"
+        row["col28"] = "y"
+        return row
+
+    spreadsheet.range("MapCoalesceTest!A:AB").map(touch_wide_columns)
+
+    assert sent_updates == [
+        {"range": "AA2:AB5", "values": [["x", "y"]] * 4},
+    ]
+
+    updated_values = worksheet.get("AA2:AB6")
+    assert updated_values == [["x", "y"]] * 4 + [["r5c27", "r5c28"]]
+
+    cleanup_test_worksheet("MapCoalesceTest")
+
+
+def test_map_splits_writes_into_bounded_batches():
+    worksheet = create_test_worksheet("MapBatchTest", rows=30, cols=2)
+    test_data = [["name", "score"]] + [[f"player{i}", str(i)] for i in range(1, 21)]
+    worksheet.update(test_data, "A1:B21")
+
+    spreadsheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+
+    def double_score(row: dict) -> dict:
+        row["score"] = str(int(row["score"]) * 2)
+        return row
+
+    report = spreadsheet.range("MapBatchTest!A:B").map(
+        double_score, max_batch_cells=6, write_concurrency=2
+    )
+
+    assert report.ok
+    assert len(report.batches) == 4
+    assert all(batch.cells <= 6 for batch in report.batches)
+    assert report.updated_cells == 20
+
+    updated_values = worksheet.get("B2:B21")
+    assert [row[0] for row in updated_values] == [str(i * 2) for i in range(1, 21)]
+
+    cleanup_test_worksheet("MapBatchTest")
+
+
+def double_even_quantities(row: dict):
+    quantity = int(row["quantity"])
+    if quantity % 2:
+        return None
+    row["quantity"] = str(quantity * 2)
+    return row
+
+
+@pytest.mark.parametrize("options", [
+    {"workers": 3, "transform_chunk_rows": 2},
+    {"executor": "process", "workers": 2, "transform_chunk_rows": 3},
+])
+def test_map_runs_transforms_on_a_pool(options):
+    worksheet = create_test_worksheet("MapParallelTest", rows=30, cols=2)
+    worksheet.update(
+        [["name", "quantity"]] + [[f"item{i}", str(i)] for i in range(1, 11)],
+        "A1:B11"
+    )
+    
+    spreadsheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    spreadsheet.range("MapParallelTest!A1:B11").map(double_even_quantities, **options)
+    
+    quantities = [row["quantity"] for row in spreadsheet.range("MapParallelTest!A1:B11").iter()]
+    assert quantities == ["1", "4", "3", "8", "5", "12", "7", "16", "9", "20"]
+    
+    cleanup_test_worksheet("MapParallelTest")
+
+
+def test_map_rejects_unknown_executor():
+    spreadsheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    with pytest.raises(ValueError):
+        spreadsheet.range("Sheet1!A1:C4").map(double_even_quantities, executor="fibers")
+
+
+def test_streaming_map_writes_band_by_band(monkeypatch):
+    worksheet = create_test_worksheet("MapStreamTest", rows=30, cols=2)
+    worksheet.update(
+        [["name", "quantity"]] + [[f"item{i}", str(i)] for i in range(1, 11)],
+        "A1:B11"
+    )
+    
+    spreadsheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    written_ranges = []
+    original_batch_update = WorksheetProxy.batch_update
+    
+    def recording_batch_update(self, updates):
+        written_ranges.append([update["range"] for update in updates])
+        return original_batch_update(self, updates)
+    
+    monkeypatch.setattr(WorksheetProxy, "batch_update", recording_batch_update)
+    
+    report = spreadsheet.range("MapStreamTest!A:B").map(double_even_quantities, chunk_rows=4, prefetch=2)
+    
+    quantities = [row["quantity"] for row in spreadsheet.range("MapStreamTest!A:B").iter()]
+    assert quantities == ["1", "4", "3", "8", "5", "12", "7", "16", "9", "20"]
+    # One write per band of four input rows
+    assert written_ranges == [["B3:B3", "B5:B5"], ["B7:B7", "B9:B9"], ["B11:B11"]]
+    assert [batch.index for batch in report.batches] == [0, 1, 2]
+    
+    cleanup_test_worksheet("MapStreamTest")
+
+
+def test_map_resumes_from_journal(tmp_path):
+    worksheet = create_test_worksheet("MapJournalTest", rows=30, cols=2)
+    worksheet.update(
+        [["name", "quantity"]] + [[f"item{i}", str(i)] for i in range(1, 11)],
+        "A1:B11"
+    )
+    
+    spreadsheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    journal = tmp_path / "map.journal"
+    seen = []
+    crash = [True]
+    
+    def increment(row: dict) -> dict:
+        seen.append(row["name"])
+        if row["name"] == "item8" and crash[0]:
+            raise RuntimeError("worker died")
+        row["quantity"] = str(int(row["quantity"]) + 100)
+        return row
+    
+    with pytest.raises(RuntimeError):
+        spreadsheet.range("MapJournalTest!A:B").map(increment, chunk_rows=3, journal=journal)
+    
+    seen.clear()
+    crash[0] = False
+    spreadsheet.range("MapJournalTest!A:B").map(increment, chunk_rows=3, journal=journal, resume=True)
+    
+    # Bands of rows 2-4 and 5-7 were committed before the failure and are not redone
+    assert seen == ["item7", "item8", "item9", "item10"]
+    quantities = [row["quantity"] for row in spreadsheet.range("MapJournalTest!A:B").iter()]
+    assert quantities == [str(i + 100) for i in range(1, 11)]
+    
+    cleanup_test_worksheet("MapJournalTest")
+
+
+def test_map_warns_when_write_concurrency_exceeds_pool_size():
+    worksheet = create_test_worksheet("MapPoolSizeTest", rows=10, cols=2)
+    worksheet.update([["name", "score"], ["player1", "1"]], "A1:B2")
+
+    spreadsheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    pool_size = spreadsheet._pool.pool_size
+
+    with pytest.warns(RuntimeWarning, match="pool_size"):
+        spreadsheet.range("MapPoolSizeTest!A:B").map(lambda row: row, write_concurrency=pool_size + 1)
+
+    cleanup_test_worksheet("MapPoolSizeTest")
@@ -0,0 +1,103 @@
+"""
+Test serving ranges from a local SQLite mirror
+"""
+from pydantic import BaseModel
+from tractable import Spreadsheet
+from tractable.connection_pool import WorksheetProxy
+from tractable.mirror import SheetMirror
+from tests.helpers import get_test_credentials, get_test_sheet_id, create_test_worksheet, cleanup_test_worksheet
+
+
+class Item(BaseModel):
+    name: str
+    quantity: int
+
+
+def test_mirror_serves_reads_until_the_sheet_changes(tmp_path, monkeypatch):
+    worksheet = create_test_worksheet("MirrorTest", rows=20, cols=3)
+    worksheet.update([
+        ["name", "quantity", "notes"],
+        ["Apple", "10", "fresh"],
+        ["Banana", "15"],
+    ], "A1:C3")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    mirror = sheet.mirror(tmp_path / "mirror.db")
+    
+    reads = []
+    original_get = WorksheetProxy.get
+    
+    def counting_get(self, *args, **kwargs):
+        reads.append(args)
+        return original_get(self, *args, **kwargs)
+    
+    monkeypatch.setattr(WorksheetProxy, "get", counting_get)
+    
+    first = list(sheet.range("MirrorTest!A:C").iter(Item))
+    assert len(reads) == 1
+    
+    second = list(sheet.range("MirrorTest!A:C").iter(Item))
+    as_dicts = list(sheet.range("MirrorTest!A:C").iter())
+    total = sheet.range("MirrorTest!A:C").reduce(lambda acc, item: acc + item.quantity, initial=0, model=Item)
+    assert len(reads) == 1
+    assert second == first == [Item(name="Apple", quantity=10), Item(name="Banana", quantity=15)]
+    assert as_dicts == [{"name": "Apple", "quantity": "10", "notes": "fresh"}, {"name": "Banana", "quantity": "15"}]
+    assert total == 25
+    
+    worksheet.update([["Cherry", "8"]], "A4:B4")
+    
+    refreshed = list(sheet.range("MirrorTest!A:C").iter(Item))
+    assert len(reads) == 2
+    assert [item.name for item in refreshed] == ["Apple", "Banana", "Cherry"]
+    
+    connection = mirror.connect()
+    table = SheetMirror.table_name(f"{sheet.spreadsheet.id}/MirrorTest!A:C")
+    assert connection.execute(f'SELECT name FROM {table} WHERE quantity = "8"').fetchall() == [("Cherry",)]
+    connection.close()
+    
+    cleanup_test_worksheet("MirrorTest")
+
+
+def test_abandoned_refresh_keeps_previous_copy(tmp_path):
+    mirror = SheetMirror(tmp_path / "mirror.db")
+    
+    list(mirror.store("sheet/A:B", ["name", "score"], iter([(2, ["a", "1"]), (3, ["b"])]), "t1"))
+    
+    partial = mirror.store("sheet/A:B", ["other"], iter([(2, ["x"]), (3, ["y"])]), "t2")
+    next(partial)
+    partial.close()
+    
+    assert mirror.load("sheet/A:B", "t2") is None
+    headers, rows = mirror.load("sheet/A:B", "t1")
+    assert headers == ["name", "score"]
+    assert list(rows) == [(2, ["a", "1"]), (3, ["b"])]
+
+
+def test_mirrored_ranges_can_be_read_while_another_is_being_read(tmp_path):
+    worksheet = create_test_worksheet("MirrorNestedTest", rows=20, cols=4)
+    worksheet.update([
+        ["name", "quantity", "city", "size"],
+        ["Apple", "10", "Oslo", "S"],
+        ["Banana", "15", "Rome", "M"],
+    ], "A1:D3")
+
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    sheet.mirror(tmp_path / "mirror.db")
+    items = sheet.range("MirrorNestedTest!A:B")
+    places = sheet.range("MirrorNestedTest!C:D")
+
+    # Cold: both refreshes are in progress at once
+    pairs = list(zip(items.iter(), places.iter()))
+    nested = [(item["name"], place["city"]) for item in items.iter() for place in places.iter()]
+    assert [(item["name"], place["city"]) for item, place in pairs] == [("Apple", "Oslo"), ("Banana", "Rome")]
+    assert nested == [("Apple", "Oslo"), ("Apple", "Rome"), ("Banana", "Oslo"), ("Banana", "Rome")]
+
+    # Warm reads of one range stay open while the other is refreshed
+    worksheet.update([["Lima", "L"]], "C4:D4")
+    seen = []
+    for item in items.iter():
+        seen.append((item["name"], [place["city"] for place in places.iter()]))
+    assert seen == [("Apple", ["Oslo", "Rome", "Lima"]), ("Banana", ["Oslo", "Rome", "Lima"])]
+    assert not list(tmp_path.glob("*.staging"))
+
+    cleanup_test_worksheet("MirrorNestedTest")
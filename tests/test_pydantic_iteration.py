@@ -2,9 +2,10 @@
 Test iterating over ranges with Pydantic models
 """
 import pytest
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from tractable import Spreadsheet
+from tractable.connection_pool import SpreadsheetProxy
 from tests.helpers import get_test_credentials, get_test_sheet_id, get_gspread_client
 
 
@@ -206,4 +207,50 @@ def test_iterate_with_pydantic_model_extras():
     assert users[0].status == "active"
     assert users[0].department == "Engineering"
     assert users[1].department == "Sales"
-    assert users[2].department == "Marketing"
\ No newline at end of file
+    assert users[2].department == "Marketing"
+
+class Contact(BaseModel):
+    name: str
+    email_address: str = Field(alias="email")
+    score: Optional[float] = None
+
+
+def test_projected_iteration_fetches_only_model_columns(monkeypatch):
+    service_account_dict = get_test_credentials()
+    sheet_id = get_test_sheet_id()
+    
+    gspread_client = get_gspread_client()
+    sheet = gspread_client.open_spreadsheet(sheet_id)
+    
+    worksheet = sheet.sheet1
+    worksheet.clear()
+    worksheet.update([
+        ["name", "notes", "email", "score", "more notes"],
+        ["Alice", "long text", "alice@example.com", "95.5", "x"],
+        ["Bob", "", "bob@example.com", "", "y"],
+        ["Charlie", "z", "charlie@example.com", "92.3"],
+    ], "A1:E4")
+    
+    spreadsheet = Spreadsheet(service_account_dict, sheet_id)
+    
+    requested = []
+    original_batch_get = SpreadsheetProxy.batch_get
+    
+    def recording_batch_get(self, range_names):
+        requested.append(list(range_names))
+        return original_batch_get(self, range_names)
+    
+    monkeypatch.setattr(SpreadsheetProxy, "batch_get", recording_batch_get)
+    
+    full = list(spreadsheet.range("Sheet1!A:E").iter(Contact))
+    projected = list(spreadsheet.range("Sheet1!A:E").iter(Contact, project=True))
+    chunked = list(spreadsheet.range("Sheet1!A:E").iter(Contact, project=True, chunk_rows=2))
+    total = spreadsheet.range("Sheet1!A:E").reduce(
+        lambda acc, contact: acc + (contact.score or 0), initial=0.0, model=Contact, project=True
+    )
+    
+    assert projected == full
+    assert chunked == full
+    assert total == pytest.approx(187.8)
+    assert requested[0] == ["'Sheet1'!A2:A", "'Sheet1'!C2:D"]
+    assert requested[1] == ["'Sheet1'!A2:A3", "'Sheet1'!C2:D3"]
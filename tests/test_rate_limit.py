@@ -0,0 +1,55 @@
+"""
+Test the client-side rate limiter used by the connection pool
+"""
+import threading
+import time
+import pytest
+from tractable.rate_limit import READ, WRITE, RateLimiter, TokenBucket
+
+
+def test_token_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket(requests_per_minute=1200, burst=5)
+
+    delays = [bucket.reserve() for _ in range(8)]
+
+    assert delays[:5] == [0.0] * 5
+    # Refill is (1200 - 5) / 60 tokens per second
+    assert delays[5] == pytest.approx(60 / 1195, rel=0.1)
+    assert delays[7] == pytest.approx(3 * 60 / 1195, rel=0.1)
+
+
+def test_token_bucket_is_shared_safely_across_threads():
+    bucket = TokenBucket(requests_per_minute=1200, burst=10)
+    start = time.monotonic()
+
+    def worker():
+        for _ in range(10):
+            bucket.acquire()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 40 requests: 10 from the burst, 30 paced at ~19.9 per second
+    assert time.monotonic() - start == pytest.approx(30 * 60 / 1190, rel=0.2)
+
+
+def test_rate_limiter_keeps_reads_and_writes_separate():
+    limiter = RateLimiter(read_requests_per_minute=None, write_requests_per_minute=60)
+
+    assert all(limiter.reserve(READ) == 0.0 for _ in range(100))
+    # The default burst is a tenth of the quota
+    assert [limiter.reserve(WRITE) for _ in range(6)] == [0.0] * 6
+    assert limiter.reserve(WRITE) > 0.0
+
+
+def test_token_bucket_supports_quotas_of_one_request_per_minute_or_less():
+    bucket = TokenBucket(requests_per_minute=0.5)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(120, rel=0.01)
+
+    with pytest.raises(ValueError, match="burst"):
+        TokenBucket(requests_per_minute=5, burst=5)
@@ -0,0 +1,118 @@
+"""
+Test keyed upserts with Range.upsert
+"""
+import pytest
+from pydantic import BaseModel
+from tractable import Spreadsheet
+from tractable.connection_pool import WorksheetProxy
+from tests.helpers import get_test_credentials, get_test_sheet_id, create_test_worksheet, cleanup_test_worksheet
+
+
+class Contact(BaseModel):
+    email: str
+    name: str
+
+
+def test_upsert_updates_matching_rows_and_appends_the_rest(monkeypatch):
+    worksheet = create_test_worksheet("UpsertTest", rows=10, cols=3)
+    worksheet.update([
+        ["email", "name", "notes"],
+        ["a@example.com", "Alice", "keep"],
+        ["b@example.com", "Bob", "keep"],
+        ["c@example.com", "Carol", "keep"],
+    ], "A1:C4")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    reads = []
+    original_get = WorksheetProxy.get
+    
+    def counting_get(self, *args, **kwargs):
+        reads.append(args)
+        return original_get(self, *args, **kwargs)
+    
+    writes = []
+    original_batch_update = WorksheetProxy.batch_update
+    
+    def counting_batch_update(self, updates, *args, **kwargs):
+        writes.append([update['range'] for update in updates])
+        return original_batch_update(self, updates, *args, **kwargs)
+    
+    monkeypatch.setattr(WorksheetProxy, "get", counting_get)
+    monkeypatch.setattr(WorksheetProxy, "batch_update", counting_batch_update)
+    
+    report = sheet.range("UpsertTest!A:C").upsert([
+        Contact(email="b@example.com", name="Robert"),
+        {"email": "d@example.com", "name": "Dana"},
+        Contact(email="c@example.com", name="Caroline"),
+    ], key="email", model=Contact)
+    
+    assert (report.updated_rows, report.appended_rows) == (2, 1)
+    assert reads == [("A1:C1",), ("A2:A",)]
+    assert writes == [["A3:B4"]]
+    
+    assert worksheet.get("A1:C5") == [
+        ["email", "name", "notes"],
+        ["a@example.com", "Alice", "keep"],
+        ["b@example.com", "Robert", "keep"],
+        ["c@example.com", "Caroline", "keep"],
+        ["d@example.com", "Dana"],
+    ]
+    
+    report = sheet.range("UpsertTest!A:C").upsert([{"email": "a@example.com", "notes": "vip"}], key="email")
+    assert (report.updated_rows, report.appended_rows) == (1, 0)
+    assert worksheet.get("A2:C2") == [["a@example.com", "Alice", "vip"]]
+    
+    cleanup_test_worksheet("UpsertTest")
+
+
+def test_upsert_stops_matching_at_the_first_blank_key():
+    worksheet = create_test_worksheet("UpsertBlankTest", rows=10, cols=2)
+    worksheet.update([
+        ["email", "name"],
+        ["a@example.com", "Alice"],
+        ["", ""],
+        ["b@example.com", "Bob"],
+    ], "A1:B4")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    report = sheet.range("UpsertBlankTest!A:B").upsert([Contact(email="b@example.com", name="Robert")], key="email")
+    
+    assert (report.updated_rows, report.appended_rows) == (0, 1)
+    assert worksheet.get("A4:B4") == [["b@example.com", "Bob"]]
+    
+    cleanup_test_worksheet("UpsertBlankTest")
+
+
+def test_upsert_rejects_a_filtered_range():
+    worksheet = create_test_worksheet("UpsertWhereTest", rows=10, cols=2)
+    worksheet.update([["email", "name"], ["a@example.com", "Alice"]], "A1:B2")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    with pytest.raises(ValueError, match="where"):
+        sheet.range("UpsertWhereTest!A:B").where(name="Bob").upsert(
+            [Contact(email="a@example.com", name="Alicia")], key="email"
+        )
+    assert worksheet.get("A1:B3") == [["email", "name"], ["a@example.com", "Alice"]]
+    
+    cleanup_test_worksheet("UpsertWhereTest")
+
+
+def test_chunked_read_after_upsert_append_stays_inside_grid():
+    worksheet = create_test_worksheet("UpsertGridTest", rows=4, cols=2)
+    worksheet.update([["email", "name"], ["a@example.com", "Alice"]], "A1:B2")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    report = sheet.range("UpsertGridTest!A:B").upsert([
+        Contact(email="b@example.com", name="Bob"),
+        Contact(email="c@example.com", name="Carol"),
+    ], key="email")
+    assert report.appended_rows == 2
+    
+    rows = list(sheet.range("UpsertGridTest!A:B").iter(Contact, chunk_rows=3))
+    assert [contact.name for contact in rows] == ["Alice", "Bob", "Carol"]
+    
+    cleanup_test_worksheet("UpsertGridTest")
@@ -0,0 +1,66 @@
+"""
+Test the row change feed of Range.watch
+"""
+from pydantic import BaseModel
+from tractable import RowChange, Spreadsheet
+from tractable.connection_pool import SpreadsheetProxy, WorksheetProxy
+from tractable.watch import RangeSnapshot
+from tests.helpers import get_test_credentials, get_test_sheet_id, create_test_worksheet, cleanup_test_worksheet
+
+
+class Item(BaseModel):
+    name: str
+    quantity: int
+
+
+def test_snapshot_diff_reports_changed_inserted_and_removed_positions():
+    before = RangeSnapshot(["name"], [(2, ["a"]), (3, ["b"]), (4, ["c"]), (5, ["d"])], block_rows=2)
+    after = RangeSnapshot(["name"], [(2, ["a"]), (3, ["b"]), (4, ["C"])], block_rows=2)
+    longer = RangeSnapshot(["name"], [(2, ["a"]), (3, ["b"]), (4, ["c"]), (5, ["d"]), (6, ["e"])], block_rows=2)
+    
+    assert after.diff(before) == [("changed", 2), ("removed", 3)]
+    assert longer.diff(before) == [("inserted", 4)]
+    assert before.diff(None) == [("inserted", 0), ("inserted", 1), ("inserted", 2), ("inserted", 3)]
+
+
+def test_watch_yields_only_modified_rows(monkeypatch):
+    worksheet = create_test_worksheet("WatchTest", rows=20, cols=2)
+    worksheet.update([
+        ["name", "quantity"],
+        ["Apple", "10"],
+        ["Banana", "15"],
+        ["Cherry", "8"],
+    ], "A1:B4")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    reads = []
+    original_get = WorksheetProxy.get
+    
+    def counting_get(self, *args, **kwargs):
+        reads.append(args)
+        return original_get(self, *args, **kwargs)
+    
+    monkeypatch.setattr(WorksheetProxy, "get", counting_get)
+    
+    polls = []
+    original_modified_time = SpreadsheetProxy.modified_time
+    
+    def edit_between_polls(self):
+        polls.append(None)
+        if len(polls) == 3:
+            worksheet.update([["Banana", "16"], ["", ""]], "A3:B4")
+        return original_modified_time(self)
+    
+    monkeypatch.setattr(SpreadsheetProxy, "modified_time", edit_between_polls)
+    
+    changes = list(sheet.range("WatchTest!A:B").watch(0, Item, max_polls=4))
+    
+    assert changes == [
+        RowChange("changed", 3, Item(name="Banana", quantity=16)),
+        RowChange("removed", 4),
+    ]
+    # The unchanged second poll did not read the range
+    assert len(reads) == 2
+    
+    cleanup_test_worksheet("WatchTest")
@@ -0,0 +1,117 @@
+"""
+Test filtering rows on raw cells with Range.where
+"""
+import pytest
+from pydantic import BaseModel, field_validator
+from tractable import Spreadsheet
+from tests.helpers import get_test_credentials, get_test_sheet_id, create_test_worksheet, cleanup_test_worksheet
+
+
+validated = []
+
+
+class Order(BaseModel):
+    order_id: str
+    status: str
+    quantity: int
+    
+    @field_validator("order_id")
+    @classmethod
+    def record_validation(cls, value):
+        validated.append(value)
+        return value
+
+
+class Quantity(BaseModel):
+    quantity: int
+
+
+def test_where_filters_rows_before_they_are_decoded():
+    worksheet = create_test_worksheet("WhereTest", rows=10, cols=3)
+    worksheet.update([
+        ["order_id", "status", "quantity"],
+        ["1", "pending", "5"],
+        ["2", "shipped", "7"],
+        ["3", "pending", "not a number"],
+        ["4", "pending", "2"],
+    ], "A1:C5")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    orders = sheet.range("WhereTest!A:C")
+    
+    validated.clear()
+    pending = orders.where(status="pending").where(lambda cells: cells["quantity"].isdigit())
+    assert [order.order_id for order in pending.iter(Order)] == ["1", "4"]
+    assert validated == ["1", "4"]
+    
+    assert [row["order_id"] for row in orders.where(quantity=7).iter()] == ["2"]
+    assert orders.where(status="pending", order_id=4).reduce(
+        lambda total, item: total + item.quantity, initial=0, model=Quantity, project=True
+    ) == 2
+    
+    transformed = []
+    
+    def ship(order):
+        transformed.append(order.order_id)
+        order.status = "shipped"
+        return order
+    
+    pending.map(ship, model=Order)
+    assert transformed == ["1", "4"]
+    assert worksheet.get("B2:B5") == [["shipped"], ["shipped"], ["pending"], ["shipped"]]
+    
+    cleanup_test_worksheet("WhereTest")
+
+
+def test_map_journal_rejects_resume_with_a_different_filter(tmp_path):
+    worksheet = create_test_worksheet("WhereJournalTest", rows=10, cols=2)
+    worksheet.update([["name", "status"], ["a", "new"], ["b", "old"], ["c", "new"]], "A1:B4")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    journal = tmp_path / "map.journal"
+    
+    def mark(row):
+        row["name"] = row["name"].upper()
+        return row
+    
+    sheet.range("WhereJournalTest!A:B").where(status="new").map(mark, journal=journal)
+    
+    with pytest.raises(ValueError, match="different map"):
+        sheet.range("WhereJournalTest!A:B").where(status="old").map(mark, journal=journal, resume=True)
+    
+    cleanup_test_worksheet("WhereJournalTest")
+
+
+def test_batch_iter_applies_the_filter_of_ranges_passed_in():
+    worksheet = create_test_worksheet("WhereBatchTest", rows=10, cols=2)
+    worksheet.update([["name", "k"], ["a", "1"], ["b", "2"], ["c", "2"], ["d", "3"]], "A1:B5")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    
+    (twos,) = sheet.batch_iter([sheet.range("WhereBatchTest!A1:B5").where(k="2")])
+    
+    assert [row["name"] for row in twos] == ["b", "c"]
+    
+    cleanup_test_worksheet("WhereBatchTest")
+
+
+def test_where_formats_values_as_sheets_displays_them():
+    worksheet = create_test_worksheet("WhereFormatTest", rows=5, cols=3)
+    worksheet.update([
+        ["order_id", "active", "score"],
+        ["1", "TRUE", "1"],
+        ["2", "FALSE", "2.5"],
+    ], "A1:C3")
+    
+    sheet = Spreadsheet(get_test_credentials(), get_test_sheet_id())
+    orders = sheet.range("WhereFormatTest!A:C")
+    
+    assert [row["order_id"] for row in orders.where(active=True).iter()] == ["1"]
+    assert [row["order_id"] for row in orders.where(active=False).iter()] == ["2"]
+    assert [row["order_id"] for row in orders.where(score=1.0).iter()] == ["1"]
+    assert [row["order_id"] for row in orders.where(score=2.5).iter()] == ["2"]
+    
+    with pytest.raises(ValueError, match="score"):
+        orders.where(score=[1])
+    
+    cleanup_test_worksheet("WhereFormatTest")
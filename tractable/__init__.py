@@ -2,5 +2,7 @@
 Tractable - Type-safe, async-first Python library for Google Sheets operations
 """
 from .spreadsheet import Spreadsheet
+from .batch import BatchUpdateError, UpsertReport, WriteReport
+from .watch import RowChange
 
-__all__ = ['Spreadsheet']
\ No newline at end of file
+__all__ = ['Spreadsheet', 'BatchUpdateError', 'WriteReport', 'UpsertReport', 'RowChange']
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""
+A1 notation helpers for tractable
+"""
+import re
+
+
+# Sheets columns run up to ZZZ, so anything with more letters is a name, not a cell
+_A1_CELL = re.compile(r'^([A-Za-z]{0,3})([0-9]*)$')
+
+
+def column_to_index(letters):
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index
+
+
+def index_to_column(index):
+    letters = ""
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def parse_a1_range(cell_range):
+    """Parse A1 notation into 1-based (start_col, start_row, end_col, end_row).
+
+    Open ends (``A:D``, ``A2:Z``) are returned as None. Returns None when the
+    string is not A1 notation, e.g. a named range or a bare worksheet title.
+    """
+    parts = cell_range.split(':')
+    if len(parts) > 2:
+        return None
+    
+    matches = [_A1_CELL.match(part) for part in parts]
+    if any(match is None or not (match.group(1) or match.group(2)) for match in matches):
+        return None
+    
+    start, end = matches[0], matches[-1]
+    if len(parts) == 1 and not (start.group(1) and start.group(2)):
+        # A bare "A" or "3" is a column or row name, not a cell
+        return None
+    
+    start_col = column_to_index(start.group(1)) if start.group(1) else 1
+    start_row = int(start.group(2)) if start.group(2) else 1
+    end_col = column_to_index(end.group(1)) if end.group(1) else None
+    end_row = int(end.group(2)) if end.group(2) else None
+    return start_col, start_row, end_col, end_row
+
+
+def format_a1_range(start_col, end_col, first_row, last_row):
+    """Format a range; a last_row of None leaves the rows open-ended (``A2:C``)"""
+    last = last_row if last_row is not None else ""
+    return f"{index_to_column(start_col)}{first_row}:{index_to_column(end_col)}{last}"
@@ -0,0 +1,160 @@
+"""
+Single-pass aggregates over parsed column buffers
+"""
+import math
+
+from . import columns as columns_module
+
+
+AGGREGATES = ("sum", "count", "min", "max", "mean", "distinct")
+_NUMERIC_AGGREGATES = ("sum", "min", "max", "mean")
+
+
+def plan_columns(aggregates, group_by, dtypes=None):
+    """dtypes for every column read: numeric aggregates parse as float, the rest as text"""
+    for name, spec in aggregates.items():
+        if not (isinstance(spec, tuple) and len(spec) == 2):
+            raise ValueError(f"Aggregate {name!r} must be a (column, function) pair")
+        if spec[1] not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate function {spec[1]!r}; expected one of {', '.join(AGGREGATES)}")
+
+    dtypes = dict(dtypes or {})
+    for column in group_by:
+        dtypes.setdefault(column, str)
+    for column, function in aggregates.values():
+        if function in _NUMERIC_AGGREGATES:
+            dtypes.setdefault(column, float)
+    for column, _ in aggregates.values():
+        dtypes.setdefault(column, str)
+    return dtypes
+
+
+def _is_missing(value):
+    return value == "" or (isinstance(value, float) and math.isnan(value))
+
+
+def _numpy_aggregates(buffers, aggregates, group_by):
+    np = columns_module.np
+    size = len(next(iter(buffers.values()))) if buffers else 0
+
+    # Dense group ids from the combined codes of every group_by column
+    codes = np.zeros(size, dtype=np.int64)
+    for column in group_by:
+        labels, inverse = np.unique(buffers[column].astype(str), return_inverse=True)
+        codes = codes * len(labels) + inverse.reshape(-1)
+    if group_by:
+        _, first_rows, groups = np.unique(codes, return_index=True, return_inverse=True)
+        # Number groups in order of first appearance, as the pure Python path does
+        order = np.argsort(first_rows)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        first_rows, groups = first_rows[order], rank[groups.reshape(-1)]
+    else:
+        first_rows, groups = np.zeros(1, dtype=np.int64), codes
+    group_count = len(first_rows)
+
+    results = {}
+    for name, (column, function) in aggregates.items():
+        values = buffers[column]
+        if values.dtype.kind == 'f':
+            valid = ~np.isnan(values)
+        elif values.dtype == object:
+            valid = values != ""
+        else:
+            valid = np.ones(size, dtype=bool)
+        present, group_ids = values[valid], groups[valid]
+        counts = np.bincount(group_ids, minlength=group_count)
+
+        if function == "count":
+            result = counts
+        elif function == "distinct":
+            labels, value_codes = np.unique(
+                present.astype(str) if present.dtype == object else present, return_inverse=True
+            )
+            stride = max(len(labels), 1)
+            pairs = np.unique(group_ids * stride + value_codes.reshape(-1))
+            result = np.bincount(pairs // stride, minlength=group_count)
+        elif function in ("sum", "mean"):
+            result = np.bincount(group_ids, weights=present.astype(float), minlength=group_count).astype(float)
+            if function == "mean":
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    result = np.where(counts > 0, result / np.maximum(counts, 1), np.nan)
+        else:
+            ufunc, start = (np.minimum, np.inf) if function == "min" else (np.maximum, -np.inf)
+            result = np.full(group_count, start)
+            ufunc.at(result, group_ids, present.astype(float))
+            result = np.where(counts > 0, result, np.nan)
+        results[name] = result.tolist()
+
+    keys = [
+        tuple(buffers[column][row] for column in group_by)
+        for row in first_rows.tolist()
+    ]
+    return keys, results
+
+
+def _python_aggregates(buffers, aggregates, group_by):
+    size = len(next(iter(buffers.values()))) if buffers else 0
+    key_columns = [buffers[column] for column in group_by]
+
+    states = {} if group_by else {(): {}}
+    for row in range(size):
+        key = tuple(column[row] for column in key_columns)
+        state = states.setdefault(key, {})
+        for name, (column, function) in aggregates.items():
+            value = buffers[column][row]
+            if _is_missing(value):
+                continue
+            if function == "distinct":
+                state.setdefault(name, set()).add(value)
+            elif function == "count":
+                state[name] = state.get(name, 0) + 1
+            elif function in ("sum", "mean"):
+                total, count = state.get(name, (0.0, 0))
+                state[name] = (total + value, count + 1)
+            elif function == "min":
+                state[name] = min(state.get(name, value), value)
+            else:
+                state[name] = max(state.get(name, value), value)
+
+    keys = list(states)
+    results = {}
+    for name, (_, function) in aggregates.items():
+        column_results = []
+        for key in keys:
+            value = states[key].get(name)
+            if function == "distinct":
+                value = len(value) if value else 0
+            elif function == "count":
+                value = value or 0
+            elif function == "sum":
+                value = float(value[0]) if value else 0.0
+            elif function == "mean":
+                value = value[0] / value[1] if value else math.nan
+            elif value is None:
+                value = math.nan
+            else:
+                value = float(value)
+            column_results.append(value)
+        results[name] = column_results
+    return keys, results
+
+
+def compute_aggregates(buffers, aggregates, group_by=()):
+    """Evaluate named (column, function) aggregates over column buffers.
+
+    Without group_by the result is {name: value}; with it, results are
+    keyed by group value (a tuple when grouping by several columns).
+    Blank cells are skipped; min, max and mean of no values are NaN.
+    """
+    if columns_module.np is not None:
+        keys, results = _numpy_aggregates(buffers, aggregates, group_by)
+    else:
+        keys, results = _python_aggregates(buffers, aggregates, group_by)
+
+    rows = [{name: results[name][position] for name in aggregates} for position in range(len(keys))]
+    if not group_by:
+        return rows[0]
+    if len(group_by) == 1:
+        return {key[0]: row for key, row in zip(keys, rows)}
+    return dict(zip(keys, rows))
@@ -0,0 +1,145 @@
+"""
+Asyncio connection pool for Google Sheets API with non-blocking retry logic
+"""
+import asyncio
+from typing import Any, Optional
+from urllib.parse import quote
+
+from google.auth.transport.requests import Request
+from google.oauth2.service_account import Credentials
+from gspread.exceptions import APIError
+from gspread.utils import absolute_range_name
+
+from .rate_limit import READ, WRITE, RateLimiter
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+# Field mask for worksheet metadata: no cell data, formats or named ranges
+METADATA_FIELDS = "sheets.properties(sheetId,title,index,gridProperties(rowCount,columnCount))"
+SHEETS_API_URL = "https://sheets.googleapis.com/v4/spreadsheets"
+SCOPES = [
+    "https://spreadsheets.google.com/feeds",
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
+
+
+class AsyncSheetsConnectionPool:
+    """Non-blocking counterpart of SheetsConnectionPool for one event loop.
+
+    Requests go through httpx, 429 backoff uses asyncio.sleep, and at most
+    ``max_concurrency`` requests are in flight at once.
+    """
+    def __init__(
+        self,
+        service_account_dict,
+        max_retries=5,
+        initial_delay=2.0,
+        backoff_factor=2.0,
+        max_concurrency=10,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        if httpx is None:
+            raise ImportError("The async API requires httpx: pip install 'tractable[async]'")
+
+        self.max_retries = max_retries
+        self.initial_delay = initial_delay
+        self.backoff_factor = backoff_factor
+        self.rate_limiter = rate_limiter or RateLimiter()
+
+        self._credentials = Credentials.from_service_account_info(service_account_dict).with_scopes(SCOPES)
+        self._client = httpx.AsyncClient(timeout=120)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._token_lock = asyncio.Lock()
+
+    async def _authorization(self):
+        async with self._token_lock:
+            if not self._credentials.valid:
+                # google-auth only offers a blocking refresh; keep it off the loop
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self._credentials.refresh, Request())
+        return {"Authorization": f"Bearer {self._credentials.token}"}
+
+    async def _with_retry(self, method: str, url: str, kind: str = READ, **kwargs) -> Any:
+        """Send a request with exponential backoff retry on rate limit errors"""
+        delay = self.initial_delay
+
+        for attempt in range(self.max_retries + 1):
+            wait = self.rate_limiter.reserve(kind)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            async with self._semaphore:
+                headers = await self._authorization()
+                response = await self._client.request(method, url, headers=headers, **kwargs)
+
+            if response.is_success:
+                return response.json()
+            if response.status_code == 429 and attempt < self.max_retries:
+                await asyncio.sleep(delay)
+                delay *= self.backoff_factor
+                continue
+            raise APIError(response)
+
+    async def fetch_sheet_metadata(self, spreadsheet_id: str):
+        """Fetch worksheet properties only, without cell data"""
+        return await self._with_retry(
+            "GET",
+            f"{SHEETS_API_URL}/{spreadsheet_id}",
+            params={"fields": METADATA_FIELDS}
+        )
+
+    async def values_get(self, spreadsheet_id: str, range_name: str):
+        return await self._with_retry("GET", f"{SHEETS_API_URL}/{spreadsheet_id}/values/{quote(range_name)}")
+
+    async def values_batch_update(self, spreadsheet_id: str, data):
+        return await self._with_retry(
+            "POST",
+            f"{SHEETS_API_URL}/{spreadsheet_id}/values:batchUpdate",
+            WRITE,
+            json={"valueInputOption": "RAW", "data": data}
+        )
+
+    async def worksheet(self, spreadsheet_id: str, title: Optional[str] = None, sheets=None):
+        """Resolve a worksheet by title, or the first worksheet when title is None.
+
+        ``sheets`` is a list of already known worksheet properties; when
+        omitted they are fetched.
+        """
+        if sheets is None:
+            metadata = await self.fetch_sheet_metadata(spreadsheet_id)
+            sheets = [sheet["properties"] for sheet in metadata.get("sheets", [])]
+        for properties in sheets:
+            if title is None or properties["title"] == title:
+                return AsyncWorksheet(self, spreadsheet_id, properties)
+        raise ValueError(f"Worksheet {title!r} not found")
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+class AsyncWorksheet:
+    """Async mirror of the WorksheetProxy calls that Range relies on"""
+    def __init__(self, pool: AsyncSheetsConnectionPool, spreadsheet_id: str, properties):
+        self._pool = pool
+        self.spreadsheet_id = spreadsheet_id
+        self.title = properties["title"]
+        grid = properties.get("gridProperties", {})
+        self.row_count = grid.get("rowCount", 0)
+        self.col_count = grid.get("columnCount", 0)
+
+    async def get(self, range_name: str):
+        """Get values from range; like gspread, an empty range comes back as [[]]"""
+        response = await self._pool.values_get(self.spreadsheet_id, absolute_range_name(self.title, range_name))
+        return response.get("values", [[]])
+
+    async def batch_update(self, updates):
+        data = [
+            {'range': absolute_range_name(self.title, update['range']), 'values': update['values']}
+            for update in updates
+        ]
+        return await self._pool.values_batch_update(self.spreadsheet_id, data)
@@ -0,0 +1,309 @@
+"""
+Payload-bounded batch_update submission for tractable
+"""
+import asyncio
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from gspread.exceptions import APIError
+
+from .a1 import format_a1_range, parse_a1_range
+
+
+# Google rejects values.batchUpdate bodies above ~10MB; stay well under it
+DEFAULT_MAX_BATCH_CELLS = 50_000
+DEFAULT_MAX_BATCH_BYTES = 2_000_000
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one planned batch_update request"""
+    index: int
+    updates: List[Dict[str, Any]]
+    cells: int
+    bytes: int
+    error: Optional[Exception] = None
+    failed_updates: List[Dict[str, Any]] = field(default_factory=list)
+    splits: int = 0
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+@dataclass
+class WriteReport:
+    """Per-batch results of a write, so failed batches can be resubmitted on their own"""
+    batches: List[BatchResult] = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return all(batch.ok for batch in self.batches)
+
+    @property
+    def failed(self):
+        return [batch for batch in self.batches if not batch.ok]
+
+    @property
+    def failed_updates(self):
+        return [update for batch in self.failed for update in batch.failed_updates]
+
+    @property
+    def updated_cells(self):
+        return sum(batch.cells for batch in self.batches) - sum(
+            update_cells(update) for update in self.failed_updates
+        )
+
+
+@dataclass
+class UpsertReport:
+    """Rows an upsert updated in place and appended, with the results of its update batches"""
+    updated_rows: int = 0
+    appended_rows: int = 0
+    writes: WriteReport = field(default_factory=WriteReport)
+
+
+class BatchUpdateError(Exception):
+    """Raised after a write in which at least one batch could not be applied"""
+    def __init__(self, report: WriteReport):
+        failed = report.failed
+        super().__init__(
+            f"{len(failed)} of {len(report.batches)} batch updates failed; "
+            f"first error: {failed[0].error}"
+        )
+        self.report = report
+
+
+def update_cells(update):
+    return sum(len(row) for row in update['values'])
+
+
+def update_bytes(update):
+    return len(json.dumps(update, separators=(',', ':')).encode())
+
+
+def split_update(update):
+    """Split a multi-row update into two halves by rows; single rows are returned as-is"""
+    values = update['values']
+    sheet_prefix, _, cell_range = update['range'].rpartition('!')
+    bounds = parse_a1_range(cell_range)
+    if len(values) < 2 or bounds is None:
+        return [update]
+
+    start_col, first_row, end_col, _ = bounds
+    end_col = end_col or start_col + max(len(row) for row in values) - 1
+    prefix = f"{sheet_prefix}!" if sheet_prefix else ""
+    middle = len(values) // 2
+    return [
+        {
+            'range': prefix + format_a1_range(start_col, end_col, first_row, first_row + middle - 1),
+            'values': values[:middle]
+        },
+        {
+            'range': prefix + format_a1_range(start_col, end_col, first_row + middle, first_row + len(values) - 1),
+            'values': values[middle:]
+        },
+    ]
+
+
+def plan_batches(updates, max_cells=DEFAULT_MAX_BATCH_CELLS, max_bytes=DEFAULT_MAX_BATCH_BYTES):
+    """Pack updates into batches that each stay under max_cells and max_bytes"""
+    batches = []
+    current, current_cells, current_bytes = [], 0, 0
+    pending = list(reversed(updates))
+
+    while pending:
+        update = pending.pop()
+        cells, size = update_cells(update), update_bytes(update)
+
+        if cells > max_cells or size > max_bytes:
+            halves = split_update(update)
+            if len(halves) > 1:
+                pending.extend(reversed(halves))
+                continue
+
+        if current and (current_cells + cells > max_cells or current_bytes + size > max_bytes):
+            batches.append(current)
+            current, current_cells, current_bytes = [], 0, 0
+        current.append(update)
+        current_cells += cells
+        current_bytes += size
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def chunk_rows_by_size(rows, max_cells=DEFAULT_MAX_BATCH_CELLS, max_bytes=DEFAULT_MAX_BATCH_BYTES):
+    """Group a stream of rows into lists that each stay under max_cells and max_bytes.
+
+    Only one chunk is held at a time; a single row over the limits gets a
+    chunk of its own.
+    """
+    chunk, chunk_cells, chunk_bytes = [], 0, 0
+    for row in rows:
+        cells, size = len(row), len(json.dumps(row, separators=(',', ':')).encode())
+        if chunk and (chunk_cells + cells > max_cells or chunk_bytes + size > max_bytes):
+            yield chunk
+            chunk, chunk_cells, chunk_bytes = [], 0, 0
+        chunk.append(row)
+        chunk_cells += cells
+        chunk_bytes += size
+    if chunk:
+        yield chunk
+
+
+def is_payload_too_large(error):
+    if not isinstance(error, APIError):
+        return False
+    if error.response.status_code == 413:
+        return True
+    message = str(error).lower()
+    return error.response.status_code == 400 and ("payload" in message or "too large" in message)
+
+
+def _bisect(updates):
+    """Halve a rejected batch: by updates first, then by the rows of a lone update"""
+    if len(updates) > 1:
+        return [updates[:len(updates) // 2], updates[len(updates) // 2:]]
+    halves = split_update(updates[0])
+    if len(halves) > 1:
+        return [[half] for half in halves]
+    return None
+
+
+def _record_failure(result, updates, error):
+    if result.error is None:
+        result.error = error
+    result.failed_updates.extend(updates)
+
+
+def _submit(worksheet, updates, result):
+    """Send one batch, bisecting it whenever the server says it is too large"""
+    try:
+        worksheet.batch_update(updates)
+    except Exception as e:
+        halves = _bisect(updates) if is_payload_too_large(e) else None
+        if halves is None:
+            _record_failure(result, updates, e)
+            return
+        result.splits += 1
+        for half in halves:
+            _submit(worksheet, half, result)
+
+
+async def _asubmit(worksheet, updates, result):
+    """Async twin of _submit for AsyncWorksheet"""
+    try:
+        await worksheet.batch_update(updates)
+    except Exception as e:
+        halves = _bisect(updates) if is_payload_too_large(e) else None
+        if halves is None:
+            _record_failure(result, updates, e)
+            return
+        result.splits += 1
+        for half in halves:
+            await _asubmit(worksheet, half, result)
+
+
+def _plan_results(updates, max_cells, max_bytes, max_workers):
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    return [
+        BatchResult(index, batch, sum(map(update_cells, batch)), sum(map(update_bytes, batch)))
+        for index, batch in enumerate(plan_batches(updates, max_cells, max_bytes))
+    ]
+
+
+def write_batches(
+    worksheet,
+    updates,
+    *,
+    max_cells=DEFAULT_MAX_BATCH_CELLS,
+    max_bytes=DEFAULT_MAX_BATCH_BYTES,
+    max_workers=1
+):
+    """Write updates in bounded batches, up to max_workers at a time.
+
+    Never raises for a failed batch; every batch is attempted and the
+    outcome of each is recorded in the returned WriteReport.
+    """
+    results = _plan_results(updates, max_cells, max_bytes, max_workers)
+
+    if max_workers == 1 or len(results) < 2:
+        for result in results:
+            _submit(worksheet, result.updates, result)
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(results))) as executor:
+            list(executor.map(lambda result: _submit(worksheet, result.updates, result), results))
+
+    return WriteReport(results)
+
+
+def write_batch_stream(
+    worksheet,
+    update_groups,
+    *,
+    max_cells=DEFAULT_MAX_BATCH_CELLS,
+    max_bytes=DEFAULT_MAX_BATCH_BYTES,
+    max_workers=1,
+    depth=2,
+    on_written=None
+):
+    """Write each group of updates on a background thread while the caller produces the next.
+
+    At most ``depth`` groups are queued or being written at once, so a
+    producer that runs ahead blocks instead of buffering. Returns one
+    WriteReport covering every group, with batches numbered in order.
+    ``on_written(group_number, report)`` is called in group order, on the
+    caller's thread, as each group finishes.
+    """
+    results = []
+    pending = deque()
+
+    def collect(group_number, future):
+        report = future.result()
+        for result in report.batches:
+            result.index = len(results)
+            results.append(result)
+        if on_written is not None:
+            on_written(group_number, report)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="tractable-writer") as writer:
+        try:
+            for group_number, updates in enumerate(update_groups):
+                pending.append((group_number, writer.submit(
+                    write_batches, worksheet, updates, max_cells=max_cells, max_bytes=max_bytes, max_workers=max_workers
+                )))
+                if len(pending) >= depth:
+                    collect(*pending.popleft())
+        finally:
+            # Even when the producer fails, groups already handed over are
+            # written and reported before the error propagates
+            while pending:
+                collect(*pending.popleft())
+
+    return WriteReport(results)
+
+
+async def awrite_batches(
+    worksheet,
+    updates,
+    *,
+    max_cells=DEFAULT_MAX_BATCH_CELLS,
+    max_bytes=DEFAULT_MAX_BATCH_BYTES,
+    max_workers=1
+):
+    """Async twin of write_batches; up to max_workers batches are awaited concurrently"""
+    results = _plan_results(updates, max_cells, max_bytes, max_workers)
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def submit(result):
+        async with semaphore:
+            await _asubmit(worksheet, result.updates, result)
+
+    await asyncio.gather(*(submit(result) for result in results))
+    return WriteReport(results)
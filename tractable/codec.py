@@ -0,0 +1,236 @@
+"""
+Compiled conversions between sheet rows and pydantic models
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+from typing import List
+
+from pydantic import AliasChoices, AliasPath, BaseModel, TypeAdapter, ValidationError
+
+
+ENCODER_CACHE_SIZE = 256
+DECODER_CACHE_SIZE = 256
+
+# Values that model_dump(mode='python') returns unchanged, so reading the
+# attribute directly gives the same cell text
+_PLAIN_TYPES = frozenset({str, int, float, bool, Decimal, datetime, date, time})
+
+
+def format_cell(value):
+    return str(value) if value is not None else ""
+
+
+def _fields_schema(schema):
+    """The model-fields entry of a model's core schema, or None if it cannot be found"""
+    definitions = {}
+    while schema is not None:
+        kind = schema.get('type')
+        if kind == 'model-fields':
+            return schema
+        if kind == 'definitions':
+            definitions.update((definition.get('ref'), definition) for definition in schema['definitions'])
+        schema = definitions.get(schema['schema_ref']) if kind == 'definition-ref' else schema.get('schema')
+    return None
+
+
+def _has_serialization(schema):
+    if isinstance(schema, dict):
+        return 'serialization' in schema or any(_has_serialization(value) for value in schema.values())
+    if isinstance(schema, (list, tuple)):
+        return any(_has_serialization(value) for value in schema)
+    return False
+
+
+def _serialized_fields(model):
+    """Fields whose dumped value can differ from the attribute because of a serializer"""
+    decorators = model.__pydantic_decorators__
+    if decorators.model_serializers:
+        return set(model.model_fields)
+
+    fields = set()
+    for serializer in decorators.field_serializers.values():
+        if '*' in serializer.info.fields:
+            return set(model.model_fields)
+        fields.update(serializer.info.fields)
+
+    # Serializers attached through Annotated (PlainSerializer, WrapSerializer)
+    # or by a custom type only show up in the core schema
+    fields_schema = _fields_schema(model.__pydantic_core_schema__)
+    if fields_schema is None:
+        return set(model.model_fields)
+    for field_name, field_schema in fields_schema['fields'].items():
+        if _has_serialization(field_schema):
+            fields.add(field_name)
+    return fields
+
+
+def _resolve_header(model, header, alias_to_field, dumped_by_alias, dumped_by_name):
+    # Same precedence as the header lookup model_to_row has always used:
+    # input aliases, then serialized names, then plain field names
+    if header in alias_to_field:
+        return alias_to_field[header]
+    if header in dumped_by_alias:
+        return dumped_by_alias[header]
+    if header in dumped_by_name:
+        return header
+    if model.model_config.get('extra') == 'allow':
+        return header
+    return None
+
+
+class RowEncoder:
+    """Turns model instances into rows for one fixed list of headers.
+
+    Header-to-field resolution happens once, when the encoder is built;
+    encoding reads plain values straight off the instance and only falls
+    back to model_dump for rows holding nested or custom-serialized values.
+    """
+    def __init__(self, model, headers):
+        alias_to_field = {}
+        for field_name, field_info in model.model_fields.items():
+            if isinstance(field_info.validation_alias, str):
+                alias_to_field[field_info.validation_alias] = field_name
+            if field_info.alias:
+                alias_to_field[field_info.alias] = field_name
+
+        dumped_by_alias = {}
+        dumped_by_name = set()
+        for field_name, field_info in model.model_fields.items():
+            if not field_info.exclude:
+                dumped_by_alias[field_info.serialization_alias or field_name] = field_name
+                dumped_by_name.add(field_name)
+        for field_name, field_info in model.model_computed_fields.items():
+            dumped_by_alias[field_info.alias or field_name] = field_name
+            dumped_by_name.add(field_name)
+
+        serialized = _serialized_fields(model)
+        plan = []
+        for header in headers:
+            field_name = _resolve_header(model, header, alias_to_field, dumped_by_alias, dumped_by_name)
+            if field_name is not None and field_name not in dumped_by_name and field_name in model.model_fields:
+                # Excluded fields never reach the dump, so their cells stay empty
+                field_name = None
+            direct = (
+                field_name in model.model_fields and field_name not in serialized
+            )
+            plan.append((field_name, direct))
+        self._plan = tuple(plan)
+        # Positions of the headers this model writes; the rest always encode as ""
+        self.owned_columns = tuple(index for index, (field_name, _) in enumerate(plan) if field_name is not None)
+
+    def __call__(self, item):
+        values = item.__dict__
+        dumped = None
+        row = []
+
+        for field_name, direct in self._plan:
+            if field_name is None:
+                row.append("")
+                continue
+            if direct:
+                value = values.get(field_name)
+                if value is None:
+                    row.append("")
+                    continue
+                if type(value) in _PLAIN_TYPES:
+                    row.append(str(value))
+                    continue
+            if dumped is None:
+                dumped = item.model_dump(mode='python')
+            row.append(format_cell(dumped.get(field_name)))
+        return row
+
+
+@lru_cache(maxsize=ENCODER_CACHE_SIZE)
+def compile_row_encoder(model, headers):
+    """Row encoder for a model class and a tuple of headers, built once and cached"""
+    return RowEncoder(model, headers)
+
+
+def input_keys(model):
+    """Every input key the model can read, or None when it may look at any key"""
+    if model.model_config.get('extra') not in (None, 'ignore'):
+        return None
+    validators = model.__pydantic_decorators__.model_validators.values()
+    if any(validator.info.mode in ('before', 'wrap') for validator in validators):
+        return None
+
+    keys = set()
+    for field_name, field_info in model.model_fields.items():
+        keys.add(field_name)
+        if field_info.alias:
+            keys.add(field_info.alias)
+        alias = field_info.validation_alias
+        for choice in alias.choices if isinstance(alias, AliasChoices) else [alias]:
+            if isinstance(choice, AliasPath):
+                choice = choice.path[0]
+            if isinstance(choice, str):
+                keys.add(choice)
+    return keys
+
+
+class RowDecoder:
+    """Turns rows into model instances for one fixed list of headers.
+
+    The columns the model can read are picked once, when the decoder is
+    built, and a whole batch of rows is validated in a single pydantic-core
+    call. Empty cells are passed as None, as dict_to_model does.
+    """
+    def __init__(self, model, headers):
+        self._model = model
+
+        keys = input_keys(model)
+        columns = {}
+        for index, header in enumerate(headers):
+            if keys is None or header in keys:
+                columns.setdefault(header, []).append(index)
+        # With repeated headers the last cell present in a row wins, so
+        # those rows keep the general zip-based path
+        self._unique = all(len(indexes) == 1 for indexes in columns.values())
+        self._columns = tuple((header, indexes[-1]) for header, indexes in columns.items())
+        self._headers = tuple(headers)
+
+        # A custom __init__ must still run for every row
+        custom_init = model.__init__ is not BaseModel.__init__
+        self._adapter = None if custom_init else TypeAdapter(List[model])
+
+    def _records(self, rows):
+        if not self._unique:
+            return [
+                {key: value if value != "" else None for key, value in zip(self._headers, row)}
+                for row in rows
+            ]
+
+        columns = self._columns
+        records = []
+        for row in rows:
+            width = len(row)
+            records.append({
+                key: cell if (cell := row[index]) != "" else None
+                for key, index in columns if index < width
+            })
+        return records
+
+    def decode(self, rows):
+        """Yield one model per row; a row that fails validation raises its own error"""
+        records = self._records(rows)
+
+        items = None
+        if self._adapter is not None:
+            try:
+                items = self._adapter.validate_python(records)
+            except ValidationError:
+                # Revalidate row by row so the rows before the bad one are
+                # still produced and the error reads as it always has
+                items = None
+        if items is None:
+            items = (self._model(**record) for record in records)
+
+        yield from items
+
+
+@lru_cache(maxsize=DECODER_CACHE_SIZE)
+def compile_row_decoder(model, headers):
+    """Row decoder for a model class and a tuple of headers, built once and cached"""
+    return RowDecoder(model, headers)
@@ -0,0 +1,136 @@
+"""
+Columnar parsing of sheet values into NumPy arrays, or array.array without NumPy
+"""
+import array
+import math
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+_KINDS = {float: 'f', int: 'i', bool: 'b', str: 'U', 'float': 'f', 'int': 'i', 'bool': 'b', 'str': 'U'}
+_NUMPY_KINDS = {'f': 'f', 'i': 'i', 'u': 'i', 'b': 'b', 'U': 'U', 'S': 'U', 'O': 'U'}
+_DEFAULT_NUMPY_DTYPES = {'f': 'float64', 'i': 'int64', 'b': 'bool', 'U': 'object'}
+_BOOL_CELLS = ("TRUE", "FALSE", "")
+
+
+def column_kind(dtype):
+    """'f', 'i', 'b' or 'U' for a float, integer, boolean or text column"""
+    if isinstance(dtype, (type, str)) and dtype in _KINDS:
+        return _KINDS[dtype]
+    if np is not None:
+        try:
+            return _NUMPY_KINDS[np.dtype(dtype).kind]
+        except (TypeError, KeyError):
+            pass
+    raise ValueError(f"Unsupported column dtype: {dtype!r}")
+
+
+def _numpy_dtype(dtype, kind):
+    if isinstance(dtype, (type, str)) and dtype in _KINDS:
+        return np.dtype(_DEFAULT_NUMPY_DTYPES[kind])
+    return np.dtype(dtype) if kind != 'U' else np.dtype(object)
+
+
+def _bool_error(upper_cells):
+    bad = next(cell for cell in upper_cells if cell not in _BOOL_CELLS)
+    return ValueError(f"Could not parse {bad!r} as a boolean")
+
+
+def _parse_numpy(cells, dtype, kind):
+    if kind == 'U':
+        return np.array(cells, dtype=object)
+    if not cells:
+        return np.array([], dtype=_numpy_dtype(dtype, kind))
+
+    values = np.array(cells, dtype=str)
+    blank = values == ""
+    if kind == 'b':
+        # Unchecked checkboxes read as FALSE; blanks count as False too
+        upper = np.char.upper(values)
+        if not np.isin(upper, _BOOL_CELLS).all():
+            raise _bool_error(upper.tolist())
+        return upper == "TRUE"
+
+    values = np.char.replace(values, ",", "")
+    if kind == 'f':
+        return np.where(blank, "nan", values).astype(_numpy_dtype(dtype, kind))
+    if blank.any():
+        raise ValueError("Integer column has blank cells; read it with a float dtype to get NaN")
+    return values.astype(_numpy_dtype(dtype, kind))
+
+
+def _parse_array(cells, kind):
+    if kind == 'U':
+        return list(cells)
+    if kind == 'b':
+        upper = [cell.upper() for cell in cells]
+        if not all(cell in _BOOL_CELLS for cell in upper):
+            raise _bool_error(upper)
+        return array.array('b', [cell == "TRUE" for cell in upper])
+    if kind == 'f':
+        return array.array('d', [float(cell.replace(",", "")) if cell != "" else math.nan for cell in cells])
+    if "" in cells:
+        raise ValueError("Integer column has blank cells; read it with a float dtype to get NaN")
+    return array.array('q', [int(cell.replace(",", "")) for cell in cells])
+
+
+def parse_column(cells, dtype=str):
+    """Parse a list of cell strings into one array of the given dtype.
+
+    Floats read blanks as NaN, booleans read blanks as False and integer
+    columns reject blanks. Thousands separators are ignored.
+    """
+    kind = column_kind(dtype)
+    if np is not None:
+        return _parse_numpy(cells, dtype, kind)
+    return _parse_array(cells, kind)
+
+
+def concat_columns(parts, dtype=str):
+    """Join arrays produced by parse_column for consecutive bands of rows"""
+    if not parts:
+        return parse_column([], dtype)
+    if len(parts) == 1:
+        return parts[0]
+    if np is not None:
+        return np.concatenate(parts)
+
+    joined = parts[0]
+    for part in parts[1:]:
+        joined.extend(part)
+    return joined
+
+
+def read_columns(headers, indexed_rows, dtypes=None, columns=None, batch_rows=None):
+    """Parse (row_index, row) pairs into {header: array}, batch_rows rows at a time.
+
+    Only ``columns`` are kept (by default every header, or the headers in
+    ``dtypes`` when given); columns without a dtype are read as text.
+    """
+    dtypes = dtypes or {}
+    if columns is None:
+        columns = list(dtypes) if dtypes else list(headers)
+
+    positions = {header: index for index, header in enumerate(headers)}
+    for name in columns:
+        if name not in positions:
+            raise ValueError(f"Column {name!r} not found in header row")
+
+    parts = {name: [] for name in columns}
+    indexed_rows = iter(indexed_rows)
+    while True:
+        batch = [row for _, row in islice(indexed_rows, batch_rows)]
+        if not batch:
+            break
+        for name in parts:
+            index = positions[name]
+            cells = [row[index] if index < len(row) else "" for row in batch]
+            parts[name].append(parse_column(cells, dtypes.get(name, str)))
+        if batch_rows is None:
+            break
+
+    return {name: concat_columns(parts[name], dtypes.get(name, str)) for name in parts}
@@ -1,40 +1,94 @@
 """
 Centralized connection pool for Google Sheets API with automatic retry logic
 """
+import asyncio
+import copy
+import queue
+import threading
 import time
-import functools
+import warnings
+import weakref
+from contextlib import contextmanager
 from typing import TypeVar, Callable, Any
 import gspread
 from google.oauth2.service_account import Credentials
-from gspread.exceptions import APIError
+from gspread.exceptions import APIError, WorksheetNotFound
+
+from .aio import METADATA_FIELDS, AsyncSheetsConnectionPool
+from .rate_limit import READ, WRITE, RateLimiter
 
 T = TypeVar('T')
 
 
 class SheetsConnectionPool:
-    def __init__(self, service_account_dict, max_retries=5, initial_delay=2.0, backoff_factor=2.0):
+    def __init__(
+        self,
+        service_account_dict,
+        max_retries=5,
+        initial_delay=2.0,
+        backoff_factor=2.0,
+        read_requests_per_minute=None,
+        write_requests_per_minute=None,
+        pool_size=1,
+        max_async_concurrency=10,
+        metadata_ttl=60.0
+    ):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        
         self.max_retries = max_retries
         self.initial_delay = initial_delay
         self.backoff_factor = backoff_factor
+        self.pool_size = pool_size
+        self.max_async_concurrency = max_async_concurrency
+        self.metadata_ttl = metadata_ttl
+        self._service_account_dict = service_account_dict
+        
+        # Wait proactively to stay under the project's quota instead of
+        # discovering it through 429s and backing off
+        self.rate_limiter = RateLimiter(read_requests_per_minute, write_requests_per_minute)
+        
+        # Each client has its own credentials and requests session, so
+        # requests on different clients really do run in parallel
+        clients = [self._authorize(service_account_dict) for _ in range(pool_size)]
+        self.client = clients[0]
+        self._idle_clients = queue.LifoQueue()
+        for client in clients:
+            self._idle_clients.put(client)
+        
+        # Cache for opened spreadsheets
+        self._spreadsheet_cache = {}
+        self._cache_lock = threading.Lock()
         
-        # Initialize gspread client
+        # httpx clients are tied to the loop they were created on
+        self._async_pools = weakref.WeakKeyDictionary()
+    
+    @staticmethod
+    def _authorize(service_account_dict):
         credentials = Credentials.from_service_account_info(service_account_dict)
         scoped_credentials = credentials.with_scopes([
             "https://spreadsheets.google.com/feeds",
             "https://www.googleapis.com/auth/spreadsheets", 
             "https://www.googleapis.com/auth/drive",
         ])
-        self.client = gspread.authorize(scoped_credentials)
-        
-        # Cache for opened spreadsheets
-        self._spreadsheet_cache = {}
+        return gspread.authorize(scoped_credentials)
+    
+    @contextmanager
+    def checkout(self):
+        """Borrow a client for the duration of the block, waiting if all are in use"""
+        client = self._idle_clients.get()
+        try:
+            yield client
+        finally:
+            self._idle_clients.put(client)
     
-    def _with_retry(self, func: Callable[..., T]) -> T:
-        """Execute a function with exponential backoff retry on rate limit errors"""
+    def _with_retry(self, func: Callable[[], T], kind: str = READ) -> T:
+        """Execute func() with exponential backoff retry on rate limit errors"""
         delay = self.initial_delay
         last_exception = None
         
         for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(kind)
             try:
                 return func()
             except APIError as e:
@@ -49,46 +103,196 @@ class SheetsConnectionPool:
         if last_exception:
             raise last_exception
     
+    def check_concurrency(self, workers: int, option: str = "write_concurrency"):
+        """Warn when more threads will send requests at once than the pool has clients.
+        
+        Every request checks out a client, so extra threads only queue for
+        one and at most pool_size requests are ever in flight.
+        """
+        if workers > self.pool_size:
+            warnings.warn(
+                f"{option}={workers} exceeds pool_size={self.pool_size}, so at most {self.pool_size} "
+                f"requests run at once; create the pool (or first Spreadsheet) with pool_size={workers}",
+                RuntimeWarning,
+                stacklevel=4
+            )
+    
     def open_spreadsheet(self, sheet_id: str):
         """Open a spreadsheet by ID with caching and retry logic"""
-        if sheet_id not in self._spreadsheet_cache:
-            spreadsheet = self._with_retry(lambda: self.client.open_by_key(sheet_id))
-            self._spreadsheet_cache[sheet_id] = SpreadsheetProxy(spreadsheet, self)
-        return self._spreadsheet_cache[sheet_id]
-    
-    def execute_with_retry(self, func: Callable[[], T]) -> T:
-        """Execute any function with retry logic"""
-        return self._with_retry(func)
+        with self._cache_lock:
+            cached = self._spreadsheet_cache.get(sheet_id)
+        if cached is not None:
+            return cached
+        
+        spreadsheet = self.execute_with_client(lambda client: client.open_by_key(sheet_id))
+        proxy = SpreadsheetProxy(spreadsheet, self, self.metadata_ttl)
+        with self._cache_lock:
+            # Another thread may have opened it meanwhile; keep the first one
+            return self._spreadsheet_cache.setdefault(sheet_id, proxy)
+    
+    def execute_with_retry(self, func: Callable[[], T], kind: str = READ) -> T:
+        """Execute any function with retry logic; kind selects the read or write rate limit.
+        
+        No client is checked out for func, so it may call proxy methods,
+        which check out their own.
+        """
+        return self._with_retry(func, kind)
+    
+    def execute_with_client(self, func: Callable[[gspread.Client], T], kind: str = READ) -> T:
+        """Execute func(client) on a checked-out pool client with retry logic.
+        
+        A client is checked out for each attempt and returned before any
+        backoff sleep, so a throttled caller never holds a client idle.
+        """
+        def attempt():
+            with self.checkout() as client:
+                return func(client)
+        
+        return self._with_retry(attempt, kind)
+    
+    def async_pool(self) -> AsyncSheetsConnectionPool:
+        """Get the async pool for the running event loop, sharing this pool's settings and rate limits"""
+        loop = asyncio.get_running_loop()
+        with self._cache_lock:
+            pool = self._async_pools.get(loop)
+            if pool is None:
+                pool = AsyncSheetsConnectionPool(
+                    self._service_account_dict,
+                    max_retries=self.max_retries,
+                    initial_delay=self.initial_delay,
+                    backoff_factor=self.backoff_factor,
+                    max_concurrency=self.max_async_concurrency,
+                    rate_limiter=self.rate_limiter
+                )
+                self._async_pools[loop] = pool
+        return pool
+    
+    async def aclose(self):
+        """Close the async pool for the running event loop, if one was created"""
+        with self._cache_lock:
+            pool = self._async_pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.aclose()
+
+
+def bind_to_client(gspread_object, client):
+    """Return a copy of a gspread Spreadsheet or Worksheet that sends its requests through client"""
+    if gspread_object.client is client.http_client:
+        return gspread_object
+    bound = copy.copy(gspread_object)
+    bound.client = client.http_client
+    return bound
 
 
 class SpreadsheetProxy:
-    """Proxy for gspread.Spreadsheet that routes all operations through the connection pool"""
-    def __init__(self, spreadsheet: gspread.Spreadsheet, pool: SheetsConnectionPool):
+    """Proxy for gspread.Spreadsheet that routes all operations through the connection pool.
+    
+    Worksheet metadata (titles, sheet ids, grid sizes) is cached for
+    ``metadata_ttl`` seconds (None keeps it until invalidated), so resolving
+    a worksheet for a range operation costs no extra request.
+    """
+    def __init__(self, spreadsheet: gspread.Spreadsheet, pool: SheetsConnectionPool, metadata_ttl=60.0):
         self._spreadsheet = spreadsheet
         self._pool = pool
         self.id = spreadsheet.id
+        self.metadata_ttl = metadata_ttl
+        
+        self._metadata_lock = threading.Lock()
+        self._worksheets = None
+        self._metadata_loaded_at = 0.0
+    
+    def _bound(self, client):
+        return bind_to_client(self._spreadsheet, client)
+    
+    def async_pool(self):
+        """Async pool for the running event loop"""
+        return self._pool.async_pool()
+    
+    def check_concurrency(self, workers, option="write_concurrency"):
+        self._pool.check_concurrency(workers, option)
+    
+    def batch_get(self, range_names):
+        """Get values for many A1 ranges, on any worksheets, in one values.batchGet request.
+        
+        Like WorksheetProxy.get, a range with no values comes back as [[]].
+        """
+        response = self._pool.execute_with_client(
+            lambda client: self._bound(client).values_batch_get(list(range_names))
+        )
+        return [value_range.get('values', [[]]) for value_range in response.get('valueRanges', [])]
+    
+    def modified_time(self):
+        """Drive modifiedTime of the spreadsheet; changes whenever any cell or sheet does"""
+        metadata = self._pool.execute_with_client(
+            lambda client: client.http_client.get_file_drive_metadata(self.id)
+        )
+        return metadata['modifiedTime']
+    
+    def invalidate(self):
+        """Drop cached worksheet metadata so the next lookup refetches it"""
+        with self._metadata_lock:
+            self._worksheets = None
+    
+    def cached_sheet_properties(self):
+        """Worksheet properties from the cache, or None if it is empty or expired"""
+        with self._metadata_lock:
+            if self._worksheets is None:
+                return None
+            if self.metadata_ttl is not None and time.monotonic() - self._metadata_loaded_at > self.metadata_ttl:
+                return None
+            return [worksheet._worksheet._properties for worksheet in self._worksheets]
+    
+    def store_sheet_properties(self, sheet_properties):
+        """Replace the cached metadata with properties fetched elsewhere (e.g. by the async pool)"""
+        worksheets = [
+            WorksheetProxy(gspread.Worksheet(self._spreadsheet, properties, self.id, self._spreadsheet.client), self._pool)
+            for properties in sorted(sheet_properties, key=lambda properties: properties.get('index', 0))
+        ]
+        with self._metadata_lock:
+            self._worksheets = worksheets
+            self._metadata_loaded_at = time.monotonic()
+        return worksheets
+    
+    def _cached_worksheets(self, refresh=False):
+        with self._metadata_lock:
+            worksheets = self._worksheets
+            fresh = worksheets is not None and (
+                self.metadata_ttl is None or time.monotonic() - self._metadata_loaded_at <= self.metadata_ttl
+            )
+        if fresh and not refresh:
+            return worksheets
+        
+        metadata = self._pool.execute_with_client(
+            lambda client: client.http_client.fetch_sheet_metadata(self.id, params={'fields': METADATA_FIELDS})
+        )
+        return self.store_sheet_properties([sheet['properties'] for sheet in metadata.get('sheets', [])])
     
     @property
     def sheet1(self):
-        """Get the first worksheet (sheet1) with retry logic"""
-        worksheet = self._pool.execute_with_retry(lambda: self._spreadsheet.sheet1)
-        return WorksheetProxy(worksheet, self._pool)
+        """Get the first worksheet (sheet1), from cached metadata when fresh"""
+        worksheets = self._cached_worksheets()
+        if not worksheets:
+            raise WorksheetNotFound("index 0 not found")
+        return worksheets[0]
     
     def worksheet(self, title: str):
-        """Get worksheet by title with retry logic"""
-        worksheet = self._pool.execute_with_retry(lambda: self._spreadsheet.worksheet(title))
-        return WorksheetProxy(worksheet, self._pool)
+        """Get worksheet by title, from cached metadata when fresh"""
+        for refresh in (False, True):
+            for worksheet in self._cached_worksheets(refresh):
+                if worksheet.title == title:
+                    return worksheet
+        raise WorksheetNotFound(title)
     
     def worksheets(self):
-        """Get all worksheets with retry logic"""
-        worksheets = self._pool.execute_with_retry(lambda: self._spreadsheet.worksheets())
-        return [WorksheetProxy(ws, self._pool) for ws in worksheets]
+        """Get all worksheets, from cached metadata when fresh"""
+        return list(self._cached_worksheets())
     
     def add_worksheet(self, title: str, rows: int, cols: int):
         """Add a new worksheet with retry logic"""
-        worksheet = self._pool.execute_with_retry(
-            lambda: self._spreadsheet.add_worksheet(title=title, rows=rows, cols=cols)
+        worksheet = self._pool.execute_with_client(
+            lambda client: self._bound(client).add_worksheet(title=title, rows=rows, cols=cols), WRITE
         )
+        self.invalidate()
         return WorksheetProxy(worksheet, self._pool)
     
     def del_worksheet(self, worksheet):
@@ -96,7 +300,10 @@ class SpreadsheetProxy:
         # Handle both WorksheetProxy and gspread.Worksheet
         if isinstance(worksheet, WorksheetProxy):
             worksheet = worksheet._worksheet
-        return self._pool.execute_with_retry(lambda: self._spreadsheet.del_worksheet(worksheet))
+        try:
+            return self._pool.execute_with_client(lambda client: self._bound(client).del_worksheet(worksheet), WRITE)
+        finally:
+            self.invalidate()
 
 
 class WorksheetProxy:
@@ -106,36 +313,65 @@ class WorksheetProxy:
         self._pool = pool
         self.title = worksheet.title
     
+    def _bound(self, client):
+        return bind_to_client(self._worksheet, client)
+    
+    @property
+    def row_count(self):
+        """Number of rows in the worksheet grid, as of the last metadata fetch"""
+        return self._worksheet.row_count
+    
+    @property
+    def col_count(self):
+        """Number of columns in the worksheet grid, as of the last metadata fetch"""
+        return self._worksheet.col_count
+    
     def get(self, range_name: str = None):
         """Get values from range with retry logic"""
-        return self._pool.execute_with_retry(lambda: self._worksheet.get(range_name))
+        return self._pool.execute_with_client(lambda client: self._bound(client).get(range_name))
     
     def batch_update(self, updates):
         """Batch update values with retry logic"""
-        return self._pool.execute_with_retry(lambda: self._worksheet.batch_update(updates))
+        # gspread rewrites each 'range' in place, so every attempt gets fresh copies
+        return self._pool.execute_with_client(
+            lambda client: self._bound(client).batch_update([dict(update) for update in updates]), WRITE
+        )
     
     def update(self, values, range_name=None):
         """Update values with retry logic"""
-        return self._pool.execute_with_retry(lambda: self._worksheet.update(values, range_name))
+        return self._pool.execute_with_client(lambda client: self._bound(client).update(values, range_name), WRITE)
+    
+    def append_rows(self, values, table_range=None):
+        """Append rows after the table found in table_range (values.append) with retry logic"""
+        return self._pool.execute_with_client(
+            lambda client: self._bound(client).append_rows(values, table_range=table_range), WRITE
+        )
     
     def clear(self):
         """Clear worksheet with retry logic"""
-        return self._pool.execute_with_retry(lambda: self._worksheet.clear())
+        return self._pool.execute_with_client(lambda client: self._bound(client).clear(), WRITE)
     
     def get_all_values(self):
         """Get all values from worksheet with retry logic"""
-        return self._pool.execute_with_retry(lambda: self._worksheet.get_all_values())
+        return self._pool.execute_with_client(lambda client: self._bound(client).get_all_values())
 
 
 # Global connection pool instance (singleton pattern)
 _global_pool = None
+_global_pool_lock = threading.Lock()
 
 
-def get_connection_pool(service_account_dict=None):
-    """Get or create the global connection pool"""
+def get_connection_pool(service_account_dict=None, **pool_options):
+    """Get or create the global connection pool.
+    
+    ``pool_options`` (e.g. ``read_requests_per_minute``) are passed to
+    SheetsConnectionPool and only take effect on first initialization.
+    """
     global _global_pool
     if _global_pool is None:
-        if service_account_dict is None:
-            raise ValueError("service_account_dict required for first initialization")
-        _global_pool = SheetsConnectionPool(service_account_dict)
+        with _global_pool_lock:
+            if _global_pool is None:
+                if service_account_dict is None:
+                    raise ValueError("service_account_dict required for first initialization")
+                _global_pool = SheetsConnectionPool(service_account_dict, **pool_options)
     return _global_pool
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Key-column lookups over a range, held in memory as compact raw rows
+"""
+import threading
+import time
+from collections.abc import Mapping
+from typing import NamedTuple
+
+from .codec import compile_row_decoder
+
+
+class _Snapshot(NamedTuple):
+    """One read of the range, replaced whole on refresh; only the decoded item cache grows"""
+    headers: tuple
+    positions: dict
+    rows: list
+    row_numbers: list
+    items: dict
+    loaded_at: float
+
+
+class RangeIndex(Mapping):
+    """Read-only mapping from key cell to row, built from one read of a range.
+
+    Rows are kept as the tuples of cell strings the API returned and only
+    turned into a model (or dict) when looked up; decoded items are cached.
+    With ``ttl`` the next access after ``ttl`` seconds rereads the range;
+    ``refresh()`` does so at any time. When several rows share a key, the
+    first one wins. Safe to share between threads: each lookup sees one
+    complete read, and only one thread rereads when the ttl runs out.
+    """
+    def __init__(self, source, key, model=None, ttl=None, chunk_rows=None):
+        self._source = source
+        self.key = key
+        self.model = model
+        self.ttl = ttl
+        self._chunk_rows = chunk_rows
+        self._refresh_lock = threading.Lock()
+        self._snapshot = self._load()
+
+    @property
+    def loaded_at(self):
+        return self._snapshot.loaded_at
+
+    def refresh(self):
+        """Reread the range and rebuild the index"""
+        with self._refresh_lock:
+            self._snapshot = self._load()
+
+    def _load(self):
+        headers, indexed_rows = self._source._source_rows(self._chunk_rows)
+        if self.key not in headers:
+            raise ValueError(f"Key column {self.key!r} not found in header row")
+        key_index = headers.index(self.key)
+
+        positions = {}
+        rows = []
+        row_numbers = []
+        for row_index, row in indexed_rows:
+            key_value = row[key_index] if key_index < len(row) else ""
+            if key_value == "" or key_value in positions:
+                continue
+            positions[key_value] = len(rows)
+            rows.append(tuple(row))
+            row_numbers.append(row_index)
+        return _Snapshot(tuple(headers), positions, rows, row_numbers, {}, time.monotonic())
+
+    def _current(self):
+        snapshot = self._snapshot
+        if self.ttl is not None and time.monotonic() - snapshot.loaded_at >= self.ttl:
+            with self._refresh_lock:
+                # Threads that waited here find the snapshot already replaced
+                if self._snapshot is snapshot:
+                    self._snapshot = self._load()
+            snapshot = self._snapshot
+        return snapshot
+
+    def __getitem__(self, key):
+        snapshot = self._current()
+        position = snapshot.positions[key]
+        item = snapshot.items.get(position)
+        if item is None:
+            # Two threads may both decode a row; setdefault keeps one result
+            item = snapshot.items.setdefault(position, self._decode(snapshot.headers, snapshot.rows[position]))
+        return item
+
+    def _decode(self, headers, row):
+        if self.model is None:
+            return dict(zip(headers, row))
+        return next(compile_row_decoder(self.model, headers).decode([row]))
+
+    def __contains__(self, key):
+        return key in self._current().positions
+
+    def __iter__(self):
+        return iter(list(self._current().positions))
+
+    def __len__(self):
+        return len(self._current().positions)
+
+    def row_number(self, key):
+        """Sheet row number of the row stored under key"""
+        snapshot = self._current()
+        return snapshot.row_numbers[snapshot.positions[key]]
@@ -0,0 +1,91 @@
+"""
+Checkpoint journal that lets an interrupted map resume where it stopped
+"""
+import bisect
+import hashlib
+import json
+import os
+
+
+# Rows per journaled band when map is not otherwise streaming
+DEFAULT_JOURNAL_BAND_ROWS = 1000
+
+
+def qualified_name(obj):
+    if obj is None:
+        return None
+    return f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', repr(obj))}"
+
+
+def map_fingerprint(spreadsheet_id, range_name, headers, transform_func, model=None, row_filter=None):
+    """Identify a map job by its target, header row, transform, model and row filter"""
+    # Committed bands span the rows a filter skipped, so a resume is only
+    # safe with the same filter
+    conditions = None
+    if row_filter is not None:
+        conditions = [
+            [list(condition) for condition in row_filter.equals],
+            [qualified_name(predicate) for predicate in row_filter.predicates],
+        ]
+    payload = json.dumps([
+        spreadsheet_id, range_name, list(headers), qualified_name(transform_func), qualified_name(model), conditions
+    ])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class MapJournal:
+    """Append-only JSON lines file of the row ranges a map has written.
+
+    The first line holds the job fingerprint; each later line is one
+    committed (first_row, last_row) band, synced to disk as soon as the
+    band's writes have succeeded.
+    """
+    def __init__(self, path, fingerprint, resume=False):
+        self.path = str(path)
+        self.fingerprint = fingerprint
+        self._starts = []
+        self._ends = []
+
+        if resume and os.path.exists(self.path):
+            self._load()
+        else:
+            with open(self.path, "w") as journal:
+                journal.write(json.dumps({"fingerprint": fingerprint}) + "\n")
+
+    def _load(self):
+        with open(self.path) as journal:
+            lines = journal.read().splitlines()
+        header = json.loads(lines[0]) if lines else {}
+        if header.get("fingerprint") != self.fingerprint:
+            raise ValueError(
+                f"Journal {self.path} belongs to a different map (range, filter, headers, transform or model changed); "
+                "rerun without resume=True to start over"
+            )
+        for line in lines[1:]:
+            try:
+                first_row, last_row = json.loads(line)["committed"]
+            except (ValueError, KeyError):
+                # A line cut short by a crash; that band was never confirmed
+                continue
+            self._add(first_row, last_row)
+
+    def _add(self, first_row, last_row):
+        # Keep disjoint, sorted ranges: merge any that overlap or touch this one
+        low = bisect.bisect_left(self._ends, first_row - 1)
+        high = bisect.bisect_right(self._starts, last_row + 1)
+        if low < high:
+            first_row = min(first_row, self._starts[low])
+            last_row = max(last_row, self._ends[high - 1])
+        self._starts[low:high] = [first_row]
+        self._ends[low:high] = [last_row]
+
+    def is_committed(self, row_index):
+        position = bisect.bisect_right(self._starts, row_index) - 1
+        return position >= 0 and row_index <= self._ends[position]
+
+    def commit(self, first_row, last_row):
+        with open(self.path, "a") as journal:
+            journal.write(json.dumps({"committed": [first_row, last_row]}) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        self._add(first_row, last_row)
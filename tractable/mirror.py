@@ -0,0 +1,155 @@
+"""
+Persistent SQLite mirror of range rows, refreshed when the spreadsheet changes
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+
+
+META_TABLE = "tractable_ranges"
+ROW_INDEX_COLUMN = "_row_index"
+INSERT_BATCH_ROWS = 500
+
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def column_names(headers):
+    """SQL column names for a header row: blanks get positional names, repeats a suffix"""
+    names = []
+    seen = set()
+    for position, header in enumerate(headers, start=1):
+        name = header or f"column_{position}"
+        candidate, suffix = name, 2
+        while candidate.lower() in seen or candidate.lower() == ROW_INDEX_COLUMN:
+            candidate, suffix = f"{name}_{suffix}", suffix + 1
+        seen.add(candidate.lower())
+        names.append(candidate)
+    return names
+
+
+class SheetMirror:
+    """Rows of each mirrored range, stored in a local SQLite file.
+
+    Each range gets a table with one TEXT column per header (plus
+    ``_row_index``), so it can also be queried and indexed locally. A
+    stored range is only served while the spreadsheet's Drive
+    modifiedTime matches the one recorded when it was fetched. The file is
+    kept in WAL mode, so it should live on a local disk.
+    """
+    def __init__(self, path):
+        self.path = str(path)
+        with self.connect() as connection:
+            # WAL lets a range being read stay open while another is refreshed
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {META_TABLE} ("
+                "key TEXT PRIMARY KEY, table_name TEXT NOT NULL, headers TEXT NOT NULL, modified_time TEXT NOT NULL)"
+            )
+        connection.close()
+
+    def connect(self):
+        """A new connection to the mirror file, e.g. for local queries"""
+        return sqlite3.connect(self.path)
+
+    @staticmethod
+    def table_name(key):
+        return "range_" + hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    def load(self, key, modified_time):
+        """(headers, lazy (row_index, row) iterator) if the stored copy is current, else None"""
+        connection = self.connect()
+        found = connection.execute(
+            f"SELECT table_name, headers FROM {META_TABLE} WHERE key = ? AND modified_time = ?",
+            (key, modified_time)
+        ).fetchone()
+        if found is None:
+            connection.close()
+            return None
+
+        table_name, headers = found
+        return json.loads(headers), self._stored_rows(connection, table_name)
+
+    @staticmethod
+    def _stored_rows(connection, table_name):
+        try:
+            cursor = connection.execute(f"SELECT * FROM {quote_identifier(table_name)} ORDER BY {ROW_INDEX_COLUMN}")
+            for row_index, *cells in cursor:
+                # NULL marks cells past the end of the row as the API sent it
+                while cells and cells[-1] is None:
+                    cells.pop()
+                yield row_index, cells
+        finally:
+            connection.close()
+
+    def store(self, key, headers, indexed_rows, modified_time):
+        """Pass (row_index, row) pairs through while writing them to the mirror.
+
+        Rows are written to a staging file beside the mirror, so reads and
+        refreshes of other ranges can run while these rows are consumed.
+        Once the rows are exhausted the new copy replaces the old one in a
+        single short transaction; stopping early leaves the old copy in place.
+        """
+        names = column_names(headers)
+        width = len(names)
+        columns = ", ".join(f"{quote_identifier(name)} TEXT" for name in names)
+        schema = f"({ROW_INDEX_COLUMN} INTEGER PRIMARY KEY{', ' if columns else ''}{columns})"
+
+        handle, staging_path = tempfile.mkstemp(
+            prefix=os.path.basename(self.path) + ".", suffix=".staging", dir=os.path.dirname(os.path.abspath(self.path))
+        )
+        os.close(handle)
+        staging = sqlite3.connect(staging_path)
+        try:
+            # A throwaway file: no journal, no fsync
+            staging.execute("PRAGMA journal_mode=OFF")
+            staging.execute("PRAGMA synchronous=OFF")
+            staging.execute(f"CREATE TABLE rows {schema}")
+
+            insert = f"INSERT INTO rows VALUES ({', '.join('?' * (width + 1))})"
+            pending = []
+            for row_index, row in indexed_rows:
+                pending.append([row_index] + list(row[:width]) + [None] * (width - len(row)))
+                if len(pending) >= INSERT_BATCH_ROWS:
+                    staging.executemany(insert, pending)
+                    pending = []
+                yield row_index, row
+            staging.executemany(insert, pending)
+            staging.commit()
+            staging.close()
+
+            self._swap_in(key, headers, schema, staging_path, modified_time)
+        finally:
+            staging.close()
+            os.remove(staging_path)
+
+    def _swap_in(self, key, headers, schema, staging_path, modified_time):
+        """Replace the stored copy of key with the staged rows in one transaction"""
+        table_name = self.table_name(key)
+        table = quote_identifier(table_name)
+
+        connection = self.connect()
+        # Manage the transaction by hand so the DROP/CREATE below roll back too
+        connection.isolation_level = None
+        try:
+            connection.execute("ATTACH DATABASE ? AS staging", (staging_path,))
+            connection.execute("BEGIN IMMEDIATE")
+            previous = connection.execute(f"SELECT headers FROM {META_TABLE} WHERE key = ?", (key,)).fetchone()
+            if previous is not None and json.loads(previous[0]) == list(headers):
+                # Same schema: keep the table, and any local indexes on it
+                connection.execute(f"DELETE FROM {table}")
+            else:
+                connection.execute(f"DROP TABLE IF EXISTS {table}")
+                connection.execute(f"CREATE TABLE {table} {schema}")
+            connection.execute(f"INSERT INTO {table} SELECT * FROM staging.rows")
+            connection.execute(
+                f"INSERT OR REPLACE INTO {META_TABLE} (key, table_name, headers, modified_time) VALUES (?, ?, ?, ?)",
+                (key, table_name, json.dumps(list(headers)), modified_time)
+            )
+            connection.execute("COMMIT")
+        finally:
+            # Uncommitted work (a failed swap) is rolled back
+            connection.close()
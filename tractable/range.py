@@ -1,12 +1,50 @@
 """
 Range class for tractable
 """
+import inspect
+import queue
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
 from typing import Optional, Type, TypeVar, Union
+from gspread.utils import absolute_range_name
 from pydantic import BaseModel
 
+from .a1 import format_a1_range, index_to_column, parse_a1_range
+from .aggregate import compute_aggregates, plan_columns
+from .batch import (
+    DEFAULT_MAX_BATCH_BYTES,
+    DEFAULT_MAX_BATCH_CELLS,
+    BatchUpdateError,
+    UpsertReport,
+    WriteReport,
+    awrite_batches,
+    chunk_rows_by_size,
+    write_batch_stream,
+    write_batches,
+)
+from .codec import compile_row_decoder, compile_row_encoder, input_keys
+from .columns import read_columns
+from .index import RangeIndex
+from .journal import DEFAULT_JOURNAL_BAND_ROWS, MapJournal, map_fingerprint
+from .watch import DEFAULT_WATCH_BLOCK_ROWS, REMOVED, RangeSnapshot, RowChange
+from .where import RowFilter
+
 
 T = TypeVar('T', bound=BaseModel)
 
+# Rows validated per pydantic-core call when decoding into models
+DEFAULT_DECODE_BATCH_ROWS = 1000
+
+# Rows handed to an executor per transform task
+DEFAULT_TRANSFORM_CHUNK_ROWS = 500
+
+# Markers for items passed from the prefetch worker to the consumer
+_ITEM, _DONE, _FAILED = range(3)
+
 
 def parse_range_notation(range_string):
     if '!' in range_string:
@@ -17,6 +55,10 @@ def parse_range_notation(range_string):
         return None, range_string
 
 
+def is_blank_row(row):
+    return all(cell == "" for cell in row)
+
+
 def row_to_dict(headers, row):
     return dict(zip(headers, row))
 
@@ -35,100 +77,659 @@ def dict_to_model(model, row_dict):
 
 
 def model_to_row(item, headers):
-    # Get model data as dict using by_alias=True to get aliased field names
-    model_data_by_alias = item.model_dump(mode='python', by_alias=True)
-    model_data = item.model_dump(mode='python')
-    
-    # Build a mapping from all possible aliases to field names
-    model_class = type(item)
-    alias_to_field = {}
-    for field_name, field_info in model_class.model_fields.items():
-        # Check for validation_alias
-        if hasattr(field_info, 'validation_alias') and field_info.validation_alias:
-            alias_to_field[field_info.validation_alias] = field_name
-        # Check for regular alias
-        if hasattr(field_info, 'alias') and field_info.alias:
-            alias_to_field[field_info.alias] = field_name
-    
-    # Build row in order of headers
-    new_row = []
-    for header in headers:
-        if header in alias_to_field:
-            # Header matches an alias
-            field_name = alias_to_field[header]
-            value = model_data.get(field_name)
-        elif header in model_data_by_alias:
-            # Header matches serialized alias name
-            value = model_data_by_alias.get(header)
-        elif header in model_data:
-            # Header matches a field name directly
-            value = model_data.get(header)
-        else:
-            # Header not found
-            value = None
-        
-        new_row.append(str(value) if value is not None else "")
-    return new_row
+    return compile_row_encoder(type(item), tuple(headers))(item)
 
 
 def dict_to_row(item, headers):
     return [str(item.get(header, "")) for header in headers]
 
 
-def format_update_range(worksheet_name, row_index, num_columns):
-    col_end = chr(ord('A') + num_columns - 1)
-    update_range = f"A{row_index}:{col_end}{row_index}"
+def diff_row(original_row, new_row):
+    """Return [(column_offset, cells)] for each run of cells in new_row that differ.
+    
+    Cells missing from the end of original_row (the API trims trailing
+    blanks) compare as empty strings.
+    """
+    spans = []
+    run_start = None
+    for offset, cell in enumerate(new_row):
+        original = original_row[offset] if offset < len(original_row) else ""
+        if cell != original:
+            if run_start is None:
+                run_start = offset
+        elif run_start is not None:
+            spans.append((run_start, new_row[run_start:offset]))
+            run_start = None
+    if run_start is not None:
+        spans.append((run_start, new_row[run_start:]))
+    return spans
+
+
+def format_update_range(worksheet_name, row_index, num_columns, start_column=1, last_row=None):
+    col_start = index_to_column(start_column)
+    col_end = index_to_column(start_column + num_columns - 1)
+    update_range = f"{col_start}{row_index}:{col_end}{last_row or row_index}"
     return update_range
 
 
+def column_spans(indexes):
+    """Group column indexes into sorted (first, last) runs of adjacent columns"""
+    spans = []
+    for index in sorted(indexes):
+        if spans and spans[-1][1] == index - 1:
+            spans[-1][1] = index
+        else:
+            spans.append([index, index])
+    return [tuple(span) for span in spans]
+
+
+def stitch_spans(span_rows, widths):
+    """Join rows read per column span side by side, dropping trailing blanks as the API does"""
+    rows = []
+    for position in range(max(map(len, span_rows), default=0)):
+        row = []
+        for values, width in zip(span_rows, widths):
+            cells = values[position] if position < len(values) else []
+            row.extend(cells)
+            row.extend([""] * (width - len(cells)))
+        while row and row[-1] == "":
+            row.pop()
+        rows.append(row)
+    return rows
+
+
+def coalesce_updates(row_spans, start_column=1):
+    """Merge per-row cell spans into as few rectangular updates as possible.
+    
+    ``row_spans`` yields (row_index, [(column_offset, cells)]) in ascending
+    row order. Spans covering the same columns on consecutive rows are
+    merged into one block, so a run of full-row rewrites becomes a single
+    ``A7:E10006`` range.
+    """
+    open_blocks = {}
+    finished = []
+    
+    for row_index, spans in row_spans:
+        for offset, cells in spans:
+            key = (offset, len(cells))
+            block = open_blocks.get(key)
+            if block is not None and block[1] == row_index - 1:
+                block[1] = row_index
+                block[2].append(cells)
+            else:
+                if block is not None:
+                    finished.append((key, block))
+                open_blocks[key] = [row_index, row_index, [cells]]
+        
+        for key in [key for key, block in open_blocks.items() if block[1] < row_index]:
+            finished.append((key, open_blocks.pop(key)))
+    
+    finished.extend(open_blocks.items())
+    finished.sort(key=lambda item: (item[1][0], item[0][0]))
+    
+    return [
+        {
+            'range': format_update_range(None, first_row, width, start_column + offset, last_row),
+            'values': values
+        }
+        for (offset, width), (first_row, last_row, values) in finished
+    ]
+
+
+def _row_limit(last_row, grid_rows, refresh=False):
+    """Last row a band may reach: last_row (None for open-ended), clipped to the worksheet grid"""
+    grid_end = grid_rows(refresh)
+    return grid_end if last_row is None else min(last_row, grid_end)
+
+
+def _fetch_bands(worksheet, start_col, end_col, first_row, last_row, chunk_rows, grid_rows):
+    """Yield (first_row, rows) for consecutive bands until the data runs out.
+    
+    Bands are clipped to the grid size from grid_rows(refresh). That size
+    may be cached, so a full band that ends on it asks again with refresh
+    set and carries on if the grid has grown since.
+    """
+    limit = _row_limit(last_row, grid_rows)
+    while first_row <= limit:
+        band_end = min(first_row + chunk_rows - 1, limit)
+        rows = worksheet.get(format_a1_range(start_col, end_col, first_row, band_end))
+        if rows == [[]]:
+            # gspread returns [[]] when the API sends back no values at all
+            rows = []
+        yield first_row, rows
+        
+        # The API trims trailing empty rows, so a short band means the data
+        # ended inside it and there is nothing left to fetch
+        if len(rows) < band_end - first_row + 1:
+            return
+        first_row = band_end + 1
+        if first_row > limit and limit != last_row:
+            limit = _row_limit(last_row, grid_rows, refresh=True)
+
+
+def _fetch_projected_bands(spreadsheet, worksheet_title, spans, first_row, last_row, grid_rows, chunk_rows=None):
+    """Like _fetch_bands, but each band reads only the given column spans in one batchGet.
+    
+    Without chunk_rows the rows are read in a single band, which stays
+    open-ended (and needs no grid size) when last_row is None.
+    """
+    widths = [last - first + 1 for first, last in spans]
+    open_ended = chunk_rows is None and last_row is None
+    limit = None if open_ended else _row_limit(last_row, grid_rows)
+    while open_ended or first_row <= limit:
+        band_end = limit if chunk_rows is None else min(first_row + chunk_rows - 1, limit)
+        values = spreadsheet.batch_get([
+            absolute_range_name(worksheet_title, format_a1_range(first, last, first_row, band_end))
+            for first, last in spans
+        ])
+        rows = stitch_spans([[] if rows == [[]] else rows for rows in values], widths)
+        yield first_row, rows
+        
+        if open_ended or len(rows) < band_end - first_row + 1:
+            return
+        first_row = band_end + 1
+        if first_row > limit and limit != last_row:
+            limit = _row_limit(last_row, grid_rows, refresh=True)
+
+
+async def _afetch_band_rows(worksheet, start_col, end_col, first_row, last_row, chunk_rows, grid_rows):
+    """Async twin of _fetch_bands, flattened to (row_index, row); grid_rows is a coroutine function"""
+    grid_end = await grid_rows(False)
+    limit = grid_end if last_row is None else min(last_row, grid_end)
+    while first_row <= limit:
+        band_end = min(first_row + chunk_rows - 1, limit)
+        rows = await worksheet.get(format_a1_range(start_col, end_col, first_row, band_end))
+        if rows == [[]]:
+            rows = []
+        for row_index, row in enumerate(rows, start=first_row):
+            yield row_index, row
+        
+        if len(rows) < band_end - first_row + 1:
+            return
+        first_row = band_end + 1
+        if first_row > limit and limit != last_row:
+            grid_end = await grid_rows(True)
+            limit = grid_end if last_row is None else min(last_row, grid_end)
+
+
+def prefetch_iter(iterable, depth):
+    """Iterate ``iterable`` on a background thread, keeping up to ``depth`` items ready.
+    
+    Exceptions raised by the worker are re-raised in the consumer. Closing the
+    returned generator early stops the worker after its current item.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    
+    def put(message):
+        while not stop.is_set():
+            try:
+                buffer.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def worker():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put((_ITEM, item)):
+                    return
+            put((_DONE, None))
+        except BaseException as e:
+            put((_FAILED, e))
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+    
+    thread = threading.Thread(target=worker, name="tractable-prefetch", daemon=True)
+    thread.start()
+    
+    try:
+        while True:
+            kind, payload = buffer.get()
+            if kind == _DONE:
+                return
+            if kind == _FAILED:
+                raise payload
+            yield payload
+    finally:
+        stop.set()
+
+
+def _take_rows(indexed_rows):
+    for row_index, row in indexed_rows:
+        if is_blank_row(row):
+            return
+        yield row_index, row
+
+
+async def _atake_rows(indexed_rows):
+    async for row_index, row in indexed_rows:
+        if is_blank_row(row):
+            return
+        yield row_index, row
+
+
+async def _aiterate(iterable):
+    for item in iterable:
+        yield item
+
+
+async def _resolve(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+def _transform_chunk(transform_func, items):
+    return [transform_func(item) for item in items]
+
+
+def transform_rows(decoded_rows, transform_func, executor=None, chunk_rows=DEFAULT_TRANSFORM_CHUNK_ROWS, max_pending=2):
+    """Yield (row_index, row, transform_func(item)) for (row_index, row, item) triples.
+    
+    With an executor, items are transformed in chunks of ``chunk_rows`` on
+    its workers, at most ``max_pending`` chunks ahead of the consumer, and
+    results come back in row order.
+    """
+    if executor is None:
+        for row_index, row, item in decoded_rows:
+            yield row_index, row, transform_func(item)
+        return
+    
+    pending = deque()
+    decoded_rows = iter(decoded_rows)
+    try:
+        while True:
+            chunk = list(islice(decoded_rows, chunk_rows))
+            if chunk:
+                items = [item for _, _, item in chunk]
+                pending.append((chunk, executor.submit(_transform_chunk, transform_func, items)))
+            if pending and (not chunk or len(pending) >= max_pending):
+                done, future = pending.popleft()
+                for (row_index, row, _), transformed in zip(done, future.result()):
+                    yield row_index, row, transformed
+            if not chunk and not pending:
+                return
+    finally:
+        # A failed transform or an abandoned map leaves no queued work behind
+        for _, future in pending:
+            future.cancel()
+
+
+def _make_executor(executor, workers):
+    """(executor, owned) for map's executor/workers options; owned executors are shut down by map"""
+    if isinstance(executor, Executor):
+        return executor, False
+    if executor is None and workers is None:
+        return None, False
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be a positive integer")
+    if executor in (None, "thread"):
+        return ThreadPoolExecutor(max_workers=workers), True
+    if executor == "process":
+        return ProcessPoolExecutor(max_workers=workers), True
+    raise ValueError("executor must be an Executor, 'thread' or 'process'")
+
+
+def _check_read_options(chunk_rows, prefetch_depth=0):
+    if chunk_rows is not None and chunk_rows < 1:
+        raise ValueError("chunk_rows must be a positive integer")
+    if prefetch_depth < 0:
+        raise ValueError("prefetch must not be negative")
+    if prefetch_depth and chunk_rows is None:
+        raise ValueError("prefetch requires chunk_rows")
+
+
+def _grid_bounds(worksheet, bounds):
+    """Fill an open column end from the worksheet grid.
+    
+    Rows are left as given: the grid size is cached and may be stale, so
+    band reads clip to it as they go (see _row_limit).
+    """
+    start_col, start_row, end_col, end_row = bounds
+    return start_col, start_row, end_col or worksheet.col_count, end_row
+
+
 class Range:
-    def __init__(self, spreadsheet, range_name):
+    def __init__(self, spreadsheet, range_name, mirror=None, row_filter=None):
         self.spreadsheet = spreadsheet
         self.range_name = range_name
+        self.mirror = mirror
+        self.row_filter = row_filter
     
-    def iter(self, model: Optional[Type[T]] = None):
-        worksheet_name, cell_range = parse_range_notation(self.range_name)
+    def where(self, predicate=None, **equals):
+        """This range restricted to the rows that meet every condition.
         
-        if worksheet_name:
-            worksheet = self.spreadsheet.worksheet(worksheet_name)
-        else:
-            worksheets = self.spreadsheet.worksheets()
-            worksheet = worksheets[0]
+        Keyword conditions compare a column's cell text, e.g.
+        ``where(status="pending")``; ``predicate`` gets a read-only mapping
+        of header to cell string. Conditions are checked on the raw cells,
+        so rows that fail them are never turned into dicts or models; the
+        filter applies to every read, including map, reduce and index.
+        upsert refuses a filtered range, since an item whose key sits in a
+        row outside the filter would be appended as a duplicate. Calls
+        chain, and each one narrows the range further.
+        """
+        row_filter = (self.row_filter or RowFilter()).where(predicate, **equals)
+        return Range(self.spreadsheet, self.range_name, self.mirror, row_filter)
+    
+    def iter(
+        self,
+        model: Optional[Type[T]] = None,
+        *,
+        chunk_rows: Optional[int] = None,
+        prefetch: int = 0,
+        project: bool = False
+    ):
+        """Iterate rows as dicts, or as model instances when a model is given.
         
-        values = worksheet.get(cell_range)
+        With ``project=True`` and a model, the header row is read first and
+        only the columns the model uses (by name or alias) are downloaded,
+        in one values.batchGet per read. Rows then end at the first row that
+        is blank in those columns.
+        """
+        headers, rows = self._source_rows(chunk_rows, prefetch, model if project else None)
         
-        if not values:
-            raise ValueError("No data found in range")
+        # Decode band by band so a chunked read never runs ahead of its fetches
+        yield from self._decode_rows(headers, rows, model, chunk_rows or DEFAULT_DECODE_BATCH_ROWS)
+    
+    def iter_values(self, values, model: Optional[Type[T]] = None):
+        """Iterate values already fetched for this range (header row first), as iter would"""
+        headers, rows = self._filter_rows(*self._split_values(values))
         
-        if len(values) < 2:
+        yield from self._decode_rows(headers, rows, model)
+    
+    def _decode_rows(self, headers, rows, model, batch_rows=DEFAULT_DECODE_BATCH_ROWS):
+        for _, _, item in self._decode_indexed(headers, rows, model, batch_rows):
+            yield item
+    
+    def _decode_indexed(self, headers, indexed_rows, model, batch_rows=DEFAULT_DECODE_BATCH_ROWS):
+        """Yield (row_index, row, item), validating models batch_rows rows at a time"""
+        if not model:
+            for row_index, row in indexed_rows:
+                yield row_index, row, row_to_dict(headers, row)
             return
         
-        headers = values[0]
-        for row in values[1:]:
-            if all(cell == "" for cell in row):
-                break
+        decoder = compile_row_decoder(model, tuple(headers))
+        indexed_rows = iter(indexed_rows)
+        while True:
+            batch = list(islice(indexed_rows, batch_rows))
+            if not batch:
+                return
+            items = decoder.decode([row for _, row in batch])
+            for (row_index, row), item in zip(batch, items):
+                yield row_index, row, item
+    
+    async def _adecode_indexed(self, headers, indexed_rows, model, batch_rows=DEFAULT_DECODE_BATCH_ROWS):
+        """Async twin of _decode_indexed"""
+        batch = []
+        async for indexed_row in indexed_rows:
+            batch.append(indexed_row)
+            if not model or len(batch) >= batch_rows:
+                for decoded in self._decode_indexed(headers, batch, model, batch_rows):
+                    yield decoded
+                batch = []
+        for decoded in self._decode_indexed(headers, batch, model, batch_rows):
+            yield decoded
+    
+    def api_range(self):
+        """This range in the form values.get/batchGet expect, quoting the worksheet title"""
+        worksheet_name, cell_range = parse_range_notation(self.range_name)
+        if worksheet_name:
+            return absolute_range_name(worksheet_name, cell_range)
+        return cell_range
+    
+    def map(
+        self,
+        transform_func,
+        *,
+        model: Optional[Type[T]] = None,
+        max_batch_cells: int = DEFAULT_MAX_BATCH_CELLS,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        write_concurrency: int = 1,
+        executor: Union[Executor, str, None] = None,
+        workers: Optional[int] = None,
+        transform_chunk_rows: int = DEFAULT_TRANSFORM_CHUNK_ROWS,
+        chunk_rows: Optional[int] = None,
+        prefetch: int = 1,
+        journal=None,
+        resume: bool = False
+    ) -> WriteReport:
+        """Apply transform_func to every row and write back the cells that changed.
+        
+        Returning None from transform_func leaves the row alone. With
+        ``executor`` (an Executor, "thread" or "process") or ``workers``,
+        transforms run in ordered chunks of ``transform_chunk_rows`` rows on
+        a pool; a process pool needs a picklable transform_func.
+        
+        With ``chunk_rows`` the map streams: rows are read in bands of that
+        many rows (``prefetch`` bands ahead), and each band's changes are
+        written on a background thread while later bands are read and
+        transformed, so memory stays bounded by a few bands.
+        
+        ``journal`` is a file path where each band is recorded once its
+        writes succeed. After a crash, rerunning with ``resume=True`` skips
+        the recorded rows; the journal must come from the same range, filter,
+        header row, transform and model.
+        """
+        if transform_chunk_rows < 1:
+            raise ValueError("transform_chunk_rows must be a positive integer")
+        _check_read_options(chunk_rows, prefetch if chunk_rows else 0)
+        self.spreadsheet.check_concurrency(write_concurrency)
+        
+        pool, owned = _make_executor(executor, workers)
+        try:
+            worksheet = self._get_worksheet()
+            headers, rows = self._read_rows(worksheet, chunk_rows, prefetch if chunk_rows else 0)
             
-            row_dict = row_to_dict(headers, row)
+            checkpoints = None
+            if journal is not None:
+                fingerprint = map_fingerprint(
+                    self.spreadsheet.id, self.range_name, headers, transform_func, model, self.row_filter
+                )
+                checkpoints = MapJournal(journal, fingerprint, resume)
+                rows = ((row_index, row) for row_index, row in rows if not checkpoints.is_committed(row_index))
             
-            if model:
-                yield dict_to_model(model, row_dict)
+            bands = self._band_updates(
+                rows,
+                headers,
+                transform_func,
+                model,
+                pool,
+                transform_chunk_rows,
+                2 * (workers or os.cpu_count() or 1),
+                chunk_rows or (DEFAULT_JOURNAL_BAND_ROWS if checkpoints else None)
+            )
+            
+            write_options = {
+                "max_cells": max_batch_cells,
+                "max_bytes": max_batch_bytes,
+                "max_workers": write_concurrency,
+            }
+            if checkpoints is not None:
+                band_rows = []
+                
+                def record(band_number, band_report):
+                    if band_report.ok:
+                        checkpoints.commit(*band_rows[band_number])
+                
+                def band_updates():
+                    for first_row, last_row, updates in bands:
+                        band_rows.append((first_row, last_row))
+                        yield updates
+                
+                report = write_batch_stream(worksheet, band_updates(), on_written=record, **write_options)
+            elif chunk_rows:
+                report = write_batch_stream(worksheet, (updates for _, _, updates in bands), **write_options)
             else:
-                yield row_dict
+                updates = [update for _, _, band_updates in bands for update in band_updates]
+                report = write_batches(worksheet, updates, **write_options)
+        finally:
+            if owned:
+                pool.shutdown()
+        
+        if not report.ok:
+            raise BatchUpdateError(report)
+        return report
     
-    def map(self, transform_func, *, model: Optional[Type[T]] = None):
+    def extend(
+        self,
+        items,
+        model: Optional[Type[T]] = None,
+        *,
+        max_batch_cells: int = DEFAULT_MAX_BATCH_CELLS,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES
+    ) -> int:
+        """Append items as new rows after the range's data, returning how many were appended.
+        
+        Items (models or dicts; dicts are validated first when a model is
+        given) are encoded against the existing header row and sent through
+        values.append in chunks bounded by cell count and request size.
+        ``items`` may be a generator; only one chunk is held at a time.
+        """
         worksheet = self._get_worksheet()
-        values = self._get_values(worksheet)
+        headers = tuple(self._read_header(worksheet))
+        _, cell_range = parse_range_notation(self.range_name)
         
-        if not values or len(values) < 2:
-            return
+        rows = (self._encode_item(item, headers, model) for item in items)
+        appended = 0
+        try:
+            for chunk in chunk_rows_by_size(rows, max_batch_cells, max_batch_bytes):
+                worksheet.append_rows(chunk, table_range=cell_range)
+                appended += len(chunk)
+        finally:
+            # gspread adds every appended row to the cached grid size, grown or not
+            self.spreadsheet.invalidate()
+        return appended
+    
+    def upsert(
+        self,
+        items,
+        key: str,
+        model: Optional[Type[T]] = None,
+        *,
+        max_batch_cells: int = DEFAULT_MAX_BATCH_CELLS,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        write_concurrency: int = 1
+    ) -> UpsertReport:
+        """Update the row whose ``key`` column matches each item, appending items with new keys.
         
-        headers = values[0]
-        updates = self._process_rows_for_update(
-            values[1:], headers, transform_func, model
+        Only the header row and the key column are read. Matching rows get
+        the cells of the columns the item owns (its model's fields, or a
+        dict's keys), coalesced into blocks and written in bounded batches;
+        the remaining items are appended in bulk, as extend does. Keys are
+        compared as the sheet displays them, and matching stops at the first
+        blank key cell, where iter and index also end. When several items
+        share a key, the last one wins. A range narrowed with where() is
+        rejected, as its filter could hide rows that hold an item's key.
+        """
+        if self.row_filter is not None:
+            raise ValueError("upsert does not support ranges filtered with where(); upsert on the unfiltered range")
+        self.spreadsheet.check_concurrency(write_concurrency)
+        worksheet = self._get_worksheet()
+        headers = tuple(self._read_header(worksheet))
+        if key not in headers:
+            raise ValueError(f"Key column {key!r} not found in header row")
+        key_index = headers.index(key)
+        
+        row_numbers = self._read_key_index(worksheet, key_index)
+        
+        changed_rows = {}
+        new_rows = {}
+        for item in items:
+            if model and not isinstance(item, BaseModel):
+                item = model(**item)
+            if isinstance(item, BaseModel):
+                encoder = compile_row_encoder(type(item), headers)
+                row, owned = encoder(item), encoder.owned_columns
+            else:
+                row = dict_to_row(item, headers)
+                owned = [index for index, header in enumerate(headers) if header in item]
+            if key_index not in owned:
+                raise ValueError(f"Item has no value for key column {key!r}: {item!r}")
+            
+            key_value = row[key_index]
+            row_index = row_numbers.get(key_value)
+            if row_index is None:
+                new_rows[key_value] = row
+            else:
+                changed_rows[row_index] = [(first, row[first:last + 1]) for first, last in column_spans(owned)]
+        
+        updates = coalesce_updates(sorted(changed_rows.items()), self._start_column())
+        writes = write_batches(
+            worksheet, updates, max_cells=max_batch_cells, max_bytes=max_batch_bytes, max_workers=write_concurrency
         )
         
-        if updates:
-            worksheet.batch_update(updates)
+        _, cell_range = parse_range_notation(self.range_name)
+        try:
+            for chunk in chunk_rows_by_size(new_rows.values(), max_batch_cells, max_batch_bytes):
+                worksheet.append_rows(chunk, table_range=cell_range)
+        finally:
+            if new_rows:
+                self.spreadsheet.invalidate()
+        
+        report = UpsertReport(len(changed_rows), len(new_rows), writes)
+        if not writes.ok:
+            raise BatchUpdateError(writes)
+        return report
+    
+    def _read_key_index(self, worksheet, key_index):
+        """Map each key cell to its row number, reading only the key column.
+        
+        Like other reads, the data ends at the first blank row; with only the
+        key column to go on, that is the first blank key cell.
+        """
+        _, cell_range = parse_range_notation(self.range_name)
+        bounds = parse_a1_range(cell_range)
+        
+        if bounds is None:
+            values = worksheet.get(cell_range)
+            first_row = 2
+            cells = [row[key_index] if key_index < len(row) else "" for row in values[1:]]
+        else:
+            start_col, start_row, _, end_row = bounds
+            first_row = start_row + 1
+            column = start_col + key_index
+            values = worksheet.get(format_a1_range(column, column, first_row, end_row))
+            cells = [row[0] if row else "" for row in values]
+        
+        row_numbers = {}
+        for row_index, cell in enumerate(cells, start=first_row):
+            if cell == "":
+                break
+            row_numbers.setdefault(cell, row_index)
+        return row_numbers
+    
+    def _source_rows(self, chunk_rows=None, prefetch_depth=0, project_model=None):
+        """Headers and (row_index, row) pairs for a read, from the mirror when it is current.
+        
+        With a mirror, a Drive modifiedTime check decides whether the stored
+        copy can be served; otherwise all columns are read (projection does
+        not apply) and written through to the mirror as they are consumed.
+        """
+        if self.mirror is None:
+            return self._read_rows(self._get_worksheet(), chunk_rows, prefetch_depth, project_model)
+        
+        _check_read_options(chunk_rows, prefetch_depth)
+        key = f"{self.spreadsheet.id}/{self.range_name}"
+        # Taken before reading, so edits made during the read make the copy stale
+        modified_time = self.spreadsheet.modified_time()
+        
+        stored = self.mirror.load(key, modified_time)
+        if stored is not None:
+            return self._filter_rows(*stored)
+        
+        # The mirror keeps every row, so filtered and unfiltered reads share it
+        headers, rows = self._read_all_rows(self._get_worksheet(), chunk_rows, prefetch_depth)
+        return self._filter_rows(headers, self.mirror.store(key, headers, rows, modified_time))
+    
+    def _filter_rows(self, headers, indexed_rows):
+        if self.row_filter is None:
+            return headers, indexed_rows
+        return headers, self.row_filter.apply(headers, indexed_rows)
     
     def _get_worksheet(self):
         worksheet_name, _ = parse_range_notation(self.range_name)
@@ -136,57 +737,390 @@ class Range:
         if worksheet_name:
             return self.spreadsheet.worksheet(worksheet_name)
         else:
-            worksheets = self.spreadsheet.worksheets()
-            return worksheets[0]
+            return self.spreadsheet.sheet1
+    
+    def _grid_rows(self, worksheet, refresh=False):
+        """Rows in the worksheet grid, from cached metadata unless refresh is set"""
+        if refresh:
+            self.spreadsheet.invalidate()
+            worksheet = self._get_worksheet()
+        return worksheet.row_count
+    
+    def _read_header(self, worksheet):
+        """Read only the header row of the range"""
+        _, cell_range = parse_range_notation(self.range_name)
+        bounds = parse_a1_range(cell_range)
+        
+        if bounds is None:
+            values = worksheet.get(cell_range)
+        else:
+            start_col, start_row, end_col, _ = _grid_bounds(worksheet, bounds)
+            values = worksheet.get(format_a1_range(start_col, end_col, start_row, start_row))
+        if not values or not values[0]:
+            raise ValueError("No header row found in range")
+        return values[0]
     
-    def _get_values(self, worksheet):
+    def _start_column(self):
         _, cell_range = parse_range_notation(self.range_name)
-        return worksheet.get(cell_range)
+        bounds = parse_a1_range(cell_range)
+        return bounds[0] if bounds else 1
     
-    def _process_rows_for_update(self, data_rows, headers, transform_func, model):
-        updates = []
-        row_index = 2
+    def _read_rows(self, worksheet, chunk_rows=None, prefetch_depth=0, project_model=None):
+        """_read_all_rows, keeping only the rows that pass this range's filter"""
+        return self._filter_rows(*self._read_all_rows(worksheet, chunk_rows, prefetch_depth, project_model))
+    
+    def _read_all_rows(self, worksheet, chunk_rows=None, prefetch_depth=0, project_model=None):
+        """Return the header row and a lazy iterator of (row_index, row).
         
-        for row in data_rows:
-            # Check for empty row BEFORE trying to prepare the item
-            if all(cell == "" for cell in row):
-                break
-            
-            item = self._prepare_item(row, headers, model)
-            transformed = transform_func(item)
+        Rows stop at the first blank row. With ``chunk_rows`` the header is
+        fetched on its own and data rows are fetched in bands of that many
+        rows, so only one band is held in memory at a time. A positive
+        ``prefetch_depth`` fetches up to that many bands ahead on a
+        background thread while the caller works on the current one.
+        
+        With ``project_model`` the header is read first and only the columns
+        that model can read are fetched; the returned headers and rows then
+        cover just those columns.
+        """
+        _, cell_range = parse_range_notation(self.range_name)
+        bounds = parse_a1_range(cell_range)
+        _check_read_options(chunk_rows, prefetch_depth)
+        
+        if bounds is None or (chunk_rows is None and project_model is None):
+            return self._split_values(worksheet.get(cell_range))
+        
+        start_col, start_row, end_col, end_row = _grid_bounds(worksheet, bounds)
+        
+        def grid_rows(refresh):
+            return self._grid_rows(worksheet, refresh)
+        
+        header_values = worksheet.get(format_a1_range(start_col, end_col, start_row, start_row))
+        if not header_values:
+            raise ValueError("No data found in range")
+        if not header_values[0]:
+            return [], iter(())
+        
+        headers = header_values[0]
+        spans = None
+        if project_model is not None:
+            keys = input_keys(project_model)
+            if keys is not None and self.row_filter is not None:
+                # Filtered columns must be fetched too; a predicate may read any of them
+                filter_columns = self.row_filter.columns()
+                keys = None if filter_columns is None else keys | filter_columns
+            if keys is not None:
+                spans = column_spans(index for index, header in enumerate(headers) if header and header in keys)
+        
+        if spans:
+            headers = [headers[index] for first, last in spans for index in range(first, last + 1)]
+            bands = _fetch_projected_bands(
+                self.spreadsheet,
+                worksheet.title,
+                [(start_col + first, start_col + last) for first, last in spans],
+                start_row + 1,
+                end_row,
+                grid_rows,
+                chunk_rows
+            )
+        elif chunk_rows is None:
+            return self._split_values(worksheet.get(cell_range))
+        else:
+            bands = _fetch_bands(worksheet, start_col, end_col, start_row + 1, end_row, chunk_rows, grid_rows)
+        
+        if prefetch_depth:
+            bands = prefetch_iter(bands, prefetch_depth)
+        return headers, _take_rows(
+            (row_index, row) for first, band in bands for row_index, row in enumerate(band, start=first)
+        )
+    
+    def _split_values(self, values):
+        """Split a full read of the range into its header row and (row_index, row) pairs"""
+        if not values:
+            raise ValueError("No data found in range")
+        _, cell_range = parse_range_notation(self.range_name)
+        bounds = parse_a1_range(cell_range)
+        first_row = bounds[1] + 1 if bounds else 2
+        return values[0], _take_rows(enumerate(values[1:], start=first_row))
+    
+    async def _aread_rows(self, worksheet, chunk_rows=None):
+        """Async twin of _read_rows for an AsyncWorksheet"""
+        headers, rows = await self._aread_all_rows(worksheet, chunk_rows)
+        if self.row_filter is None:
+            return headers, rows
+        return headers, self.row_filter.aapply(headers, rows)
+    
+    async def _aread_all_rows(self, worksheet, chunk_rows=None):
+        """Async twin of _read_all_rows for an AsyncWorksheet"""
+        _, cell_range = parse_range_notation(self.range_name)
+        bounds = parse_a1_range(cell_range)
+        _check_read_options(chunk_rows)
+        
+        if chunk_rows is None or bounds is None:
+            headers, rows = self._split_values(await worksheet.get(cell_range))
+            return headers, _aiterate(rows)
+        
+        start_col, start_row, end_col, end_row = _grid_bounds(worksheet, bounds)
+        
+        header_values = await worksheet.get(format_a1_range(start_col, end_col, start_row, start_row))
+        if not header_values:
+            raise ValueError("No data found in range")
+        if not header_values[0]:
+            return [], _aiterate(())
+        
+        async def grid_rows(refresh):
+            return await self._agrid_rows(worksheet, refresh)
+        
+        return header_values[0], _atake_rows(
+            _afetch_band_rows(worksheet, start_col, end_col, start_row + 1, end_row, chunk_rows, grid_rows)
+        )
+    
+    async def _aget_worksheet(self):
+        worksheet_name, _ = parse_range_notation(self.range_name)
+        pool = self.spreadsheet.async_pool()
+        
+        # Share the proxy's worksheet metadata cache with the async API
+        sheets = self.spreadsheet.cached_sheet_properties()
+        if sheets is None:
+            metadata = await pool.fetch_sheet_metadata(self.spreadsheet.id)
+            sheets = [sheet['properties'] for sheet in metadata.get('sheets', [])]
+            self.spreadsheet.store_sheet_properties(sheets)
+        return await pool.worksheet(self.spreadsheet.id, worksheet_name, sheets)
+    
+    async def _agrid_rows(self, worksheet, refresh=False):
+        """Async twin of _grid_rows"""
+        if refresh:
+            self.spreadsheet.invalidate()
+            worksheet = await self._aget_worksheet()
+        return worksheet.row_count
+    
+    def _band_updates(
+        self,
+        indexed_rows,
+        headers,
+        transform_func,
+        model,
+        executor=None,
+        transform_chunk_rows=DEFAULT_TRANSFORM_CHUNK_ROWS,
+        max_pending=2,
+        band_rows=None
+    ):
+        """Yield (first_row, last_row, updates) for each band of ``band_rows`` input rows.
+        
+        Without band_rows every row is one band. Bands follow the input rows,
+        so a band whose rows needed no changes yields an empty update list.
+        """
+        # Hashable headers let model_to_row reuse its compiled encoder
+        headers = tuple(headers)
+        start_column = self._start_column()
+        changed_rows = []
+        first_row = last_row = None
+        
+        decoded = self._decode_indexed(headers, indexed_rows, model, band_rows or DEFAULT_DECODE_BATCH_ROWS)
+        for row_index, row, transformed in transform_rows(
+            decoded, transform_func, executor, transform_chunk_rows, max_pending
+        ):
+            if first_row is None:
+                first_row = row_index
+            elif band_rows and row_index - first_row >= band_rows:
+                yield first_row, last_row, coalesce_updates(changed_rows, start_column)
+                changed_rows = []
+                first_row = row_index
+            last_row = row_index
             
             if transformed is not None:
-                update = self._create_update(transformed, headers, row_index, model)
-                updates.append(update)
-            
-            row_index += 1
+                spans = self._changed_spans(row, transformed, headers, model)
+                if spans:
+                    changed_rows.append((row_index, spans))
         
-        return updates
+        if first_row is not None:
+            yield first_row, last_row, coalesce_updates(changed_rows, start_column)
     
-    def _prepare_item(self, row, headers, model):
-        row_dict = row_to_dict(headers, row)
-        if model:
-            return dict_to_model(model, row_dict)
-        return row_dict
+    def _changed_spans(self, row, transformed, headers, model):
+        # Only send the cells that actually changed; an unchanged row costs nothing
+        return diff_row(row, self._encode_row(transformed, headers, model))
+    
+    def _encode_item(self, item, headers, model):
+        if model and not isinstance(item, BaseModel):
+            item = model(**item)
+        return self._encode_row(item, headers, isinstance(item, BaseModel))
     
-    def _create_update(self, transformed, headers, row_index, model):
+    def _encode_row(self, transformed, headers, model):
         if model:
-            new_row = model_to_row(transformed, headers)
-        else:
-            new_row = dict_to_row(transformed, headers)
+            return model_to_row(transformed, headers)
+        return dict_to_row(transformed, headers)
+    
+    def reduce(
+        self,
+        reducer_func,
+        *,
+        initial,
+        model: Optional[Type[T]] = None,
+        chunk_rows: Optional[int] = None,
+        prefetch: int = 0,
+        project: bool = False
+    ):
+        accumulator = initial
         
-        worksheet_name, _ = parse_range_notation(self.range_name)
-        update_range = format_update_range(worksheet_name, row_index, len(headers))
+        for item in self.iter(model, chunk_rows=chunk_rows, prefetch=prefetch, project=project):
+            accumulator = reducer_func(accumulator, item)
         
-        return {
-            'range': update_range,
-            'values': [new_row]
-        }
+        return accumulator
     
-    def reduce(self, reducer_func, *, initial, model: Optional[Type[T]] = None):
+    def index(
+        self,
+        key: str,
+        model: Optional[Type[T]] = None,
+        *,
+        ttl: Optional[float] = None,
+        chunk_rows: Optional[int] = None
+    ) -> RangeIndex:
+        """Read the range once into a mapping from ``key`` column value to row.
+        
+        Lookups are dictionary hits; a row is validated into ``model`` (or
+        turned into a dict) only when it is first looked up. Pass ``ttl``
+        seconds to reread automatically, or call ``refresh()`` on the index.
+        """
+        return RangeIndex(self, key, model, ttl, chunk_rows)
+    
+    def to_columns(
+        self,
+        dtypes: Optional[dict] = None,
+        *,
+        columns: Optional[list] = None,
+        chunk_rows: Optional[int] = None,
+        prefetch: int = 0
+    ):
+        """Read the range into {header: array}, one contiguous buffer per column.
+        
+        Arrays are NumPy arrays when NumPy is installed and array.array (lists
+        for text columns) otherwise. ``dtypes`` maps headers to float, int,
+        bool, str or a NumPy dtype; only those columns are returned unless
+        ``columns`` says otherwise. Rows stop at the first blank row, as in iter.
+        """
+        headers, rows = self._source_rows(chunk_rows, prefetch)
+        
+        return read_columns(headers, rows, dtypes, columns, chunk_rows)
+    
+    def aggregate(
+        self,
+        group_by: Union[str, list, None] = None,
+        *,
+        dtypes: Optional[dict] = None,
+        chunk_rows: Optional[int] = None,
+        prefetch: int = 0,
+        **aggregates
+    ):
+        """Compute named aggregates in a single read, e.g. total=("amount", "sum").
+        
+        Functions are sum, count, min, max, mean and distinct (number of
+        distinct values); blank cells are skipped. With ``group_by`` (one
+        header or a list of headers) the result maps each group to its
+        aggregates. Work is done on column buffers, as in to_columns.
+        """
+        group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+        dtypes = plan_columns(aggregates, group_by, dtypes)
+        
+        buffers = self.to_columns(dtypes, columns=list(dtypes), chunk_rows=chunk_rows, prefetch=prefetch)
+        return compute_aggregates(buffers, aggregates, group_by)
+    
+    def watch(
+        self,
+        interval: float = 60.0,
+        model: Optional[Type[T]] = None,
+        *,
+        block_rows: int = DEFAULT_WATCH_BLOCK_ROWS,
+        emit_initial: bool = False,
+        max_polls: Optional[int] = None
+    ):
+        """Poll the range every ``interval`` seconds and yield a RowChange per modified row.
+        
+        Rows are compared by position: inserted and changed rows carry the
+        new item, removed rows only their row index. A poll costs one Drive
+        modifiedTime check, and the range is only read when that has moved.
+        The first poll sets the baseline, unless ``emit_initial`` reports its
+        rows as inserted. Runs forever unless ``max_polls`` is given.
+        """
+        snapshot = None
+        last_modified = None
+        polls = 0
+        
+        while max_polls is None or polls < max_polls:
+            if polls:
+                time.sleep(interval)
+            polls += 1
+            
+            modified_time = self.spreadsheet.modified_time()
+            if modified_time == last_modified:
+                continue
+            
+            headers, rows = self._read_rows(self._get_worksheet())
+            rows = list(rows)
+            current = RangeSnapshot(headers, rows, block_rows)
+            changes = current.diff(snapshot) if snapshot is not None or emit_initial else []
+            previous, snapshot, last_modified = snapshot, current, modified_time
+            
+            updated = [rows[position] for kind, position in changes if kind != REMOVED]
+            items = self._decode_indexed(headers, updated, model)
+            for kind, position in changes:
+                if kind == REMOVED:
+                    yield RowChange(kind, previous.row_numbers[position])
+                else:
+                    row_index, _, item = next(items)
+                    yield RowChange(kind, row_index, item)
+    
+    async def aiter(self, model: Optional[Type[T]] = None, *, chunk_rows: Optional[int] = None):
+        worksheet = await self._aget_worksheet()
+        headers, rows = await self._aread_rows(worksheet, chunk_rows)
+        
+        async for _, _, item in self._adecode_indexed(headers, rows, model, chunk_rows or DEFAULT_DECODE_BATCH_ROWS):
+            yield item
+    
+    async def amap(
+        self,
+        transform_func,
+        *,
+        model: Optional[Type[T]] = None,
+        max_batch_cells: int = DEFAULT_MAX_BATCH_CELLS,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        write_concurrency: int = 1
+    ) -> WriteReport:
+        """Async map; transform_func may be a plain function or a coroutine function"""
+        worksheet = await self._aget_worksheet()
+        headers, rows = await self._aread_rows(worksheet)
+        headers = tuple(headers)
+        
+        changed_rows = []
+        async for row_index, row, item in self._adecode_indexed(headers, rows, model):
+            transformed = await _resolve(transform_func(item))
+            
+            if transformed is not None:
+                spans = self._changed_spans(row, transformed, headers, model)
+                if spans:
+                    changed_rows.append((row_index, spans))
+        
+        report = await awrite_batches(
+            worksheet,
+            coalesce_updates(changed_rows, self._start_column()),
+            max_cells=max_batch_cells,
+            max_bytes=max_batch_bytes,
+            max_workers=write_concurrency
+        )
+        if not report.ok:
+            raise BatchUpdateError(report)
+        return report
+    
+    async def areduce(
+        self,
+        reducer_func,
+        *,
+        initial,
+        model: Optional[Type[T]] = None,
+        chunk_rows: Optional[int] = None
+    ):
+        """Async reduce; reducer_func may be a plain function or a coroutine function"""
         accumulator = initial
         
-        for item in self.iter(model):
-            accumulator = reducer_func(accumulator, item)
+        async for item in self.aiter(model, chunk_rows=chunk_rows):
+            accumulator = await _resolve(reducer_func(accumulator, item))
         
-        return accumulator
\ No newline at end of file
+        return accumulator
@@ -0,0 +1,71 @@
+"""
+Client-side rate limiting for Google Sheets API requests
+"""
+import threading
+import time
+from typing import Optional
+
+
+READ = "read"
+WRITE = "write"
+
+
+class TokenBucket:
+    """Thread-safe token bucket that keeps any 60 second window under a per-minute quota.
+
+    Up to ``burst`` requests may go out back to back; after that requests are
+    spaced so that burst plus one minute of refill never exceeds the quota.
+    """
+    def __init__(self, requests_per_minute: float, burst: Optional[int] = None):
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        if burst is None:
+            burst = max(1, int(requests_per_minute // 10))
+        if burst > 1 and burst >= requests_per_minute:
+            raise ValueError(
+                f"burst ({burst}) must be smaller than requests_per_minute ({requests_per_minute})"
+            )
+
+        self.capacity = burst
+        # A quota of one request a minute or less leaves no room for a burst
+        # on top of the refill, so a single token refills at the full quota
+        refill = requests_per_minute - burst if burst < requests_per_minute else requests_per_minute
+        self.rate = refill / 60.0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RateLimiter:
+    """Separate read and write buckets; a bucket left as None is unlimited"""
+    def __init__(self, read_requests_per_minute=None, write_requests_per_minute=None):
+        self._buckets = {
+            READ: TokenBucket(read_requests_per_minute) if read_requests_per_minute else None,
+            WRITE: TokenBucket(write_requests_per_minute) if write_requests_per_minute else None,
+        }
+
+    def reserve(self, kind: str = READ) -> float:
+        bucket = self._buckets[kind]
+        return bucket.reserve() if bucket else 0.0
+
+    def acquire(self, kind: str = READ):
+        bucket = self._buckets[kind]
+        if bucket:
+            bucket.acquire()
@@ -3,18 +3,60 @@ Spreadsheet class for tractable
 """
 from .range import Range
 from .connection_pool import get_connection_pool
+from .mirror import SheetMirror
 
 
 class Spreadsheet:
-    def __init__(self, service_account_dict, sheet_id):
+    def __init__(self, service_account_dict, sheet_id, **pool_options):
         self.service_account_dict = service_account_dict
         self.sheet_id = sheet_id
         
-        # Get or create the global connection pool
-        pool = get_connection_pool(service_account_dict)
+        # Get or create the global connection pool; pool_options only apply
+        # when this call creates it
+        pool = get_connection_pool(service_account_dict, **pool_options)
         
         # Get spreadsheet from pool (with automatic retry)
         self.spreadsheet = pool.open_spreadsheet(sheet_id)
+        self._pool = pool
+        self._mirror = None
     
     def range(self, range_name):
-        return Range(self.spreadsheet, range_name)
\ No newline at end of file
+        return Range(self.spreadsheet, range_name, self._mirror)
+    
+    def mirror(self, path):
+        """Keep a local SQLite copy of every range read from now on.
+        
+        iter, reduce, to_columns and aggregate on ranges created after this
+        call are served from the file at ``path`` while the spreadsheet's
+        modifiedTime is unchanged, and refresh it when it has moved.
+        """
+        self._mirror = SheetMirror(path)
+        return self._mirror
+    
+    def ranges(self, range_names):
+        return [self.range(range_name) for range_name in range_names]
+    
+    def batch_iter(self, range_names, model=None):
+        """Read many ranges, across worksheets, with a single values.batchGet request.
+        
+        Returns one iterator per range, yielding dicts or models exactly as
+        Range.iter would. ``model`` is either one model for every range or a
+        list with one model (or None) per range.
+        """
+        ranges = [
+            range_name if isinstance(range_name, Range) else self.range(range_name)
+            for range_name in range_names
+        ]
+        models = model if isinstance(model, (list, tuple)) else [model] * len(ranges)
+        if len(models) != len(ranges):
+            raise ValueError("model must be a single model or one per range")
+        
+        value_lists = self.spreadsheet.batch_get([range_.api_range() for range_ in ranges])
+        return [
+            range_.iter_values(values, range_model)
+            for range_, values, range_model in zip(ranges, value_lists, models)
+        ]
+    
+    async def aclose(self):
+        """Close the HTTP client used by the async API on the running event loop"""
+        await self._pool.aclose()
@@ -0,0 +1,64 @@
+"""
+Change detection between polls of a range, using compact row and block hashes
+"""
+import array
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+INSERTED = "inserted"
+CHANGED = "changed"
+REMOVED = "removed"
+
+DEFAULT_WATCH_BLOCK_ROWS = 256
+
+
+@dataclass
+class RowChange:
+    """One row that differs from the previous poll; item is None for removed rows"""
+    kind: str
+    row_index: int
+    item: Optional[Any] = None
+
+
+class RangeSnapshot:
+    """Per-row hashes of one read, with a hash per block of block_rows rows.
+
+    Only hashes are kept, never cell values, so a snapshot of a large range
+    costs about 16 bytes per row (a hash and a row number).
+    """
+    def __init__(self, headers, indexed_rows, block_rows=DEFAULT_WATCH_BLOCK_ROWS):
+        if block_rows < 1:
+            raise ValueError("block_rows must be a positive integer")
+        self.block_rows = block_rows
+        self.headers_hash = hash(tuple(headers))
+        self.row_numbers = array.array('q', [row_index for row_index, _ in indexed_rows])
+        self.row_hashes = array.array('q', [hash(tuple(row)) for _, row in indexed_rows])
+        self.block_hashes = [
+            hash(self.row_hashes[start:start + block_rows].tobytes())
+            for start in range(0, len(self.row_hashes), block_rows)
+        ]
+
+    def __len__(self):
+        return len(self.row_hashes)
+
+    def diff(self, previous):
+        """(kind, position) for every row that differs from the previous snapshot"""
+        if previous is None:
+            return [(INSERTED, position) for position in range(len(self))]
+
+        common = min(len(self), len(previous))
+        same_headers = self.headers_hash == previous.headers_hash
+        changes = []
+        for block, start in enumerate(range(0, common, self.block_rows)):
+            if same_headers and block < len(previous.block_hashes) and (
+                self.block_hashes[block] == previous.block_hashes[block]
+            ):
+                continue
+            for position in range(start, min(start + self.block_rows, common)):
+                if not same_headers or self.row_hashes[position] != previous.row_hashes[position]:
+                    changes.append((CHANGED, position))
+
+        changes.extend((INSERTED, position) for position in range(common, len(self)))
+        changes.extend((REMOVED, position) for position in range(common, len(previous)))
+        return changes
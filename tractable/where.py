@@ -0,0 +1,92 @@
+"""
+Row filters evaluated on raw cell strings, before any dict or model is built
+"""
+from collections.abc import Mapping
+
+
+def _cell_text(column, value):
+    """The text Sheets displays for value, which where(column=value) compares cells with"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (str, int, float)):
+        return str(value)
+    raise ValueError(
+        f"where({column}=...) compares cell text and needs a str, int, float, bool or None, "
+        f"not {type(value).__name__}"
+    )
+
+
+class RawRow(Mapping):
+    """Read-only view of one row's cell strings by header, without copying the row"""
+    __slots__ = ("_positions", "_row")
+
+    def __init__(self, positions, row):
+        self._positions = positions
+        self._row = row
+
+    def __getitem__(self, header):
+        position = self._positions[header]
+        return self._row[position] if position < len(self._row) else ""
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self):
+        return len(self._positions)
+
+
+class RowFilter:
+    """Conditions a row must all meet: predicates over a RawRow, or cell == text equalities"""
+    def __init__(self, predicates=(), equals=()):
+        self.predicates = tuple(predicates)
+        self.equals = tuple(equals)
+
+    def where(self, predicate=None, **equals):
+        """A filter with these conditions added to the existing ones"""
+        predicates = self.predicates + ((predicate,) if predicate is not None else ())
+        # Cells are compared as text, so where(quantity=10) matches the cell "10"
+        # and where(active=True) the cell "TRUE"
+        conditions = tuple((column, _cell_text(column, value)) for column, value in equals.items())
+        return RowFilter(predicates, self.equals + conditions)
+
+    def columns(self):
+        """Headers the conditions read, or None when a predicate may read any of them"""
+        if self.predicates:
+            return None
+        return {column for column, _ in self.equals}
+
+    def compile(self, headers):
+        """A function telling whether a raw row meets every condition"""
+        positions = {header: index for index, header in enumerate(headers)}
+        checks = []
+        for column, text in self.equals:
+            if column not in positions:
+                raise ValueError(f"Column {column!r} not found in header row")
+            checks.append((positions[column], text))
+        predicates = self.predicates
+
+        def matches(row):
+            width = len(row)
+            for index, text in checks:
+                if (row[index] if index < width else "") != text:
+                    return False
+            if predicates:
+                view = RawRow(positions, row)
+                return all(predicate(view) for predicate in predicates)
+            return True
+
+        return matches
+
+    def apply(self, headers, indexed_rows):
+        matches = self.compile(headers)
+        return ((row_index, row) for row_index, row in indexed_rows if matches(row))
+
+    async def aapply(self, headers, indexed_rows):
+        matches = self.compile(headers)
+        async for row_index, row in indexed_rows:
+            if matches(row):
+                yield row_index, row